@@ -0,0 +1,5 @@
+"""
+benchmarks
+
+Run from the project root: python -m benchmarks.<name>
+"""
@@ -0,0 +1,50 @@
+"""
+Reply keyboard micro-benchmark: build + serialize per response vs cached markups
+
+    python -m benchmarks.keyboards [rounds]
+"""
+import sys
+import time
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+
+from bot.keyboards.reply import BUILDERS, Keyboards
+from bot.keyboards.session import CachedMarkupSession
+
+LANGS = ("uz", "ru", "en")
+
+
+def run(name: str, fn, rounds: int) -> float:
+    calls = [(kb, lang) for kb in BUILDERS for lang in LANGS]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for kb, lang in calls:
+            fn(kb, lang)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (rounds * len(calls)) * 1e6
+    print(f"{name:<34} {per_call:8.2f} us/response")
+    return per_call
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    bot = Bot(token="1:benchmark")
+    plain, cached = AiohttpSession(), CachedMarkupSession()
+    Keyboards.rebuild()
+
+    # Same request payload either way
+    for kb in BUILDERS:
+        for lang in LANGS:
+            assert plain.prepare_value(BUILDERS[kb](lang), bot, {}) == cached.prepare_value(Keyboards.get(kb, lang), bot, {})
+
+    print(f"{len(BUILDERS)} keyboards x {len(LANGS)} languages")
+    before = run("build + serialize (before)", lambda kb, lang: plain.prepare_value(BUILDERS[kb](lang), bot, {}), rounds)
+    run("build only (before)", lambda kb, lang: BUILDERS[kb](lang), rounds)
+    after = run("cached markup + cached JSON", lambda kb, lang: cached.prepare_value(Keyboards.get(kb, lang), bot, {}), rounds)
+    run("cached markup only", Keyboards.get, rounds)
+    print(f"speedup: {before / after:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
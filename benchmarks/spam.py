@@ -0,0 +1,81 @@
+"""
+Anti-spam throughput benchmark: per-pattern re.search vs one combined regex
+
+    python -m benchmarks.spam [rounds]
+"""
+import random
+import re
+import sys
+import time
+
+from services.spam_filter import DEFAULT_RULES, SpamFilter
+
+# What applicants actually type into the questionnaire
+CLEAN = [
+    "Aliyev Jasur Botirovich", "Иванова Мария Сергеевна", "John Smith",
+    "25", "1998", "+998901234567", "ha", "Да", "No",
+    "Toshkent shahri, Chilonzor tumani, 9-kvartal, 12-uy",
+    "г. Самарканд, ул. Регистан 15, кв. 4",
+    "2019-2023 TATU, dasturiy injiniring. 2023 dan beri EPAM Systems'da Python dasturchi",
+    "Работал продавцом-консультантом 2 года, затем администратором в кафе (2021-2024)",
+    "Excel, Word, 1C, English B2, Russian C1 - salary expectations 8 000 000 so'm",
+    "Email: jasur.aliyev@gmail.com, telegram @jasur_a",
+    "Ожидаемая зарплата: от 700$ на руки",
+    "O'rta maxsus, kollej 2016-2019",
+    "I can start on Monday; references available on request.",
+]
+SPAM = [
+    "$$$ EARN ₽₽₽ FAST $$$ t.me/earnfast",
+    "Заработок от 100₽ в день ₴₸ пиши в лс",
+    "@@@@@ SUBSCRIBE @@@@@",
+    "#$%^&* crypto pump #$%^&*",
+]
+
+
+class LegacyAntiSpam:
+    """Previous AntiSpamMiddleware check - re.search per pattern via the re cache"""
+
+    SPAM_PATTERNS = list(DEFAULT_RULES.values())
+
+    def match(self, text: str) -> bool:
+        for pattern in self.SPAM_PATTERNS:
+            if re.search(pattern, text):
+                return True
+        return False
+
+
+def corpus(size: int = 10_000, spam_share: float = 0.02) -> list[str]:
+    rnd = random.Random(42)
+    return [rnd.choice(SPAM if rnd.random() < spam_share else CLEAN) for _ in range(size)]
+
+
+def run(name: str, fn, texts: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    rate = rounds * len(texts) / elapsed
+    print(f"{name:<26} {rate / 1e3:8.0f} k msgs/s  {elapsed / (rounds * len(texts)) * 1e9:6.0f} ns/msg")
+    return rate
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    texts = corpus()
+    legacy, combined = LegacyAntiSpam(), SpamFilter()
+
+    # Same verdict for every message before timing anything
+    for text in CLEAN + SPAM:
+        assert legacy.match(text) == (combined.match(text) is not None), text
+
+    print(f"{len(texts)} messages, {sum(legacy.match(t) for t in texts)} spam")
+    old = run("legacy per-pattern search", legacy.match, texts, rounds)
+    combined = SpamFilter()
+    new = run("combined alternation", combined.match, texts, rounds)
+    print(f"speedup: {new / old:.1f}x")
+    print(f"counters: {combined.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Startup benchmark: `import main` to loaded catalogs + keyboards, in a fresh interpreter
+
+    python -m benchmarks.startup [runs]
+
+legacy  - pure-Python yaml.safe_load of every catalog (previous loader)
+yaml    - cache miss: libyaml parse, msgpack cache written
+cached  - msgpack cache hit
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+
+from services.language_service import CACHE_DIR, LanguageService, build_cache
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+import main
+import services.language_service as ls
+if sys.argv[1] == "legacy":
+    import yaml
+    ls.load_flat = lambda lang_file: ls.flatten(yaml.safe_load(lang_file.read_text(encoding="utf-8")))
+loaded = time.perf_counter()
+ls.get_lang_service()
+main.Keyboards.rebuild()
+ready = time.perf_counter()
+print(f"{ready - start} {ready - loaded}")
+"""
+
+
+def run(mode: str, runs: int, cache_dir: str) -> tuple[float, float]:
+    env = {**os.environ, "BOT_TOKEN": os.environ.get("BOT_TOKEN", "1:benchmark")}
+    totals, catalogs = [], []
+    for _ in range(runs):
+        if mode == "yaml":
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        out = subprocess.run(
+            [sys.executable, "-c", CHILD, mode], env=env, capture_output=True, text=True, check=True
+        ).stdout.split()
+        totals.append(float(out[-2]) * 1e3)
+        catalogs.append(float(out[-1]) * 1e3)
+    total, catalog = statistics.median(totals), statistics.median(catalogs)
+    print(f"{mode:<8} import-to-ready {total:8.1f} ms   catalogs + keyboards {catalog:7.1f} ms")
+    return total, catalog
+
+
+def main() -> None:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    lang_dir = LanguageService._find_dir()
+    cache_dir = str(lang_dir / CACHE_DIR)
+
+    print(f"median of {runs} runs")
+    _, legacy = run("legacy", runs, cache_dir)
+    run("yaml", runs, cache_dir)
+    build_cache(lang_dir)
+    _, cached = run("cached", runs, cache_dir)
+    print(f"catalog load speedup: {legacy / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
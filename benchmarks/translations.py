@@ -0,0 +1,86 @@
+"""
+Translation lookup micro-benchmark: nested YAML walk vs flattened catalog
+
+    python -m benchmarks.translations [rounds]
+"""
+import sys
+import time
+
+import yaml
+
+from services.language_service import LanguageService, get_lang_service, t
+
+
+class LegacyLanguageService:
+    """Previous LanguageService.get - walks the nested YAML dicts per call"""
+
+    def __init__(self, languages: dict):
+        self._languages = languages
+
+    def get(self, lang: str, key: str, **kwargs) -> str:
+        if lang not in self._languages:
+            lang = "uz"
+
+        value = self._languages.get(lang, {})
+        for k in key.split("."):
+            if not isinstance(value, dict):
+                return key
+            if k not in value:
+                return key
+            value = value[k]
+
+        if not isinstance(value, str):
+            return key
+
+        if kwargs:
+            try:
+                return value.format(**kwargs)
+            except KeyError:
+                return value
+        return value
+
+
+def calls_for(service: LanguageService) -> list[tuple[str, str, dict]]:
+    """Every key of every language - templates get a value for each placeholder"""
+    calls = []
+    for lang, catalog in service._catalogs.items():
+        for key, (_, names, _) in catalog.items():
+            calls.append((lang, key, {name: "x" for name in names} if names else {}))
+    return calls
+
+
+def run(name: str, fn, calls: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for lang, key, kwargs in calls:
+            fn(lang, key, **kwargs)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (rounds * len(calls)) * 1e9
+    print(f"{name:<28} {per_call:8.0f} ns/call")
+    return per_call
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    service = get_lang_service()
+    lang_dir = LanguageService._find_dir()
+    languages = {lang: yaml.safe_load((lang_dir / f"{lang}.yaml").read_text(encoding="utf-8")) for lang in service.languages()}
+    legacy_service = LegacyLanguageService(languages)
+    calls = calls_for(service)
+    templates = [c for c in calls if c[2]]
+
+    # Same output for every key before timing anything
+    for lang, key, kwargs in calls:
+        assert legacy_service.get(lang, key, **kwargs) == service.get(lang, key, **kwargs), key
+
+    print(f"{len(calls)} keys in {', '.join(sorted(languages))}, {len(templates)} with placeholders")
+    legacy = run("legacy nested walk", legacy_service.get, calls, rounds)
+    flat = run("flattened catalog", service.get, calls, rounds)
+    run("t() (flattened)", t, calls, rounds)
+    run("legacy, templates only", legacy_service.get, templates, rounds)
+    run("flattened, templates only", service.get, templates, rounds)
+    print(f"speedup: {legacy / flat:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
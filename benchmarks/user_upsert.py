@@ -0,0 +1,46 @@
+"""
+Concurrent first contact: SELECT-then-INSERT vs single-statement upsert
+
+Fires many registrations for the same user id at once against a throwaway
+SQLite database and reports failures and wall time.
+
+    python -m benchmarks.user_upsert [concurrency]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///" + os.path.join(tempfile.mkdtemp(), "bench.db")
+
+from database.config import async_session, engine, init_db
+from database.repositories.user_repository import UserRepo
+
+
+async def fire(name: str, register, concurrency: int, user_id: int) -> None:
+    async def one():
+        async with async_session() as s:
+            return await register(s, user_id, "Applicant", None, None)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(concurrency)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    created = sum(1 for r in results if not isinstance(r, Exception) and r[1])
+    kinds = sorted({type(e).__name__ for e in errors})
+    print(f"{name:<14} {elapsed * 1000:7.1f} ms  created={created}  errors={len(errors)} {kinds or ''}")
+
+
+async def main() -> None:
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    await init_db()
+    print(f"{concurrency} concurrent first messages for one user")
+    await fire("get_or_create", UserRepo.get_or_create, concurrency, user_id=1)
+    await fire("upsert", UserRepo.upsert, concurrency, user_id=2)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,19 @@
 from pathlib import Path
-from aiogram import Router, F
+from aiogram import Bot, Router, F
 from aiogram.types import Message, FSInputFile
 from aiogram.fsm.context import FSMContext
+from aiogram.exceptions import TelegramBadRequest
 from bot.keyboards.reply import Keyboards
 from bot.states.user import ApplicationState, MenuState
 from services.language_service import t
 from database.db import DB
 from bot.validators.validator import is_back, is_skip, is_confirm, is_refill, is_cancel
 from utils.helpers import get_app_id, get_lang
+from services.notifier import compose, notifier
+from services.media_cache import media_cache
+from services.outbox import outbox
+from services.media_fetcher import media_fetcher
+from database.unit_of_work import after_commit
 
 router = Router(name="confirmation_handlers")
 
@@ -86,9 +92,11 @@ async def show_confirmation(message: Message, state: FSMContext, user_lang: str
         await message.answer(text)
         
         if app.photo_path and Path(app.photo_path).exists():
+            await send_photo_preview(message, app.photo_path)
+        elif app.photo_file_id:
             try:
-                await message.answer_photo(FSInputFile(app.photo_path), caption="📸")
-            except:
+                await message.answer_photo(app.photo_file_id, caption="📸")
+            except TelegramBadRequest:
                 pass
         
         await message.answer(t(lang, "application.confirmation.ask"), reply_markup=Keyboards.confirmation(lang))
@@ -97,7 +105,46 @@ async def show_confirmation(message: Message, state: FSMContext, user_lang: str
         print(f"Error in show_confirmation: {e}")
 
 
-async def send_to_admins(message: Message, app):
+async def send_photo_preview(message: Message, photo_path: str):
+    photo = media_cache.input_file(photo_path)
+    try:
+        sent = await message.answer_photo(photo, caption="📸")
+    except TelegramBadRequest:
+        if isinstance(photo, FSInputFile):
+            return
+        # Stale file_id - upload the file again
+        media_cache.invalidate(photo_path)
+        photo = FSInputFile(photo_path)
+        try:
+            sent = await message.answer_photo(photo, caption="📸")
+        except TelegramBadRequest:
+            return
+    if isinstance(photo, FSInputFile):
+        media_cache.remember(photo_path, sent.photo[-1].file_id)
+
+
+def applicant_info(message: Message) -> dict:
+    """Telegram profile of the applicant - stored with the outbox event"""
+    user = message.from_user
+    return {
+        "user": {
+            "id": user.id,
+            "username": user.username,
+            "first_name": user.first_name,
+            "last_name": user.last_name,
+            "language_code": user.language_code,
+        }
+    }
+
+
+async def notify_admins(bot: Bot, payload: dict) -> bool:
+    """Outbox handler of "application_submitted" - True once every admin has it"""
+    app = await DB.app.get(payload["app_id"])
+    if not app:
+        return True
+    user = payload["user"]
+    delivered = payload.setdefault("delivered", [])
+
     def _val(field):
         return field.value if hasattr(field, "value") else (field or "—")
     
@@ -135,36 +182,37 @@ async def send_to_admins(message: Message, app):
     user_info = f"""
 ━━━━━━━━━━━━━━━━━━━━━
 👤 TELEGRAM INFO:
-- User ID: {message.from_user.id}
-- Username: @{message.from_user.username or "—"}
-- First Name: {message.from_user.first_name or "—"}
-- Last Name: {message.from_user.last_name or "—"}
-- Language: {message.from_user.language_code or "—"}
+- User ID: {user["id"]}
+- Username: @{user["username"] or "—"}
+- First Name: {user["first_name"] or "—"}
+- Last Name: {user["last_name"] or "—"}
+- Language: {user["language_code"] or "—"}
 """.strip()
     
-    for admin_id in ADMIN_IDS:
-        try:
-            if app.photo_path and Path(app.photo_path).exists():
-                await message.bot.send_photo(
-                    chat_id=admin_id,
-                    photo=FSInputFile(app.photo_path),
-                    caption=caption
-                )
-            else:
-                await message.bot.send_message(admin_id, caption)
-            
-            await message.bot.send_message(admin_id, user_info)
-            
-            if app.resume_path and Path(app.resume_path).exists():
-                await message.bot.send_document(
-                    chat_id=admin_id,
-                    document=FSInputFile(app.resume_path),
-                    caption="📄 Resume"
-                )
-            
-            
-        except Exception as e:
-            print(f"Failed to send to admin {admin_id}: {e}")
+    photo_path = app.photo_path if app.photo_path and Path(app.photo_path).exists() else None
+    resume_path = app.resume_path if app.resume_path and Path(app.resume_path).exists() else None
+
+    def build(admin_id: int) -> list:
+        # Not downloaded yet (LAZY_MEDIA) - Telegram still has the applicant's copy
+        photo = media_cache.input_file(photo_path) if photo_path else app.photo_file_id
+        resume = media_cache.input_file(resume_path) if resume_path else app.resume_file_id
+        return compose(
+            admin_id,
+            [caption, user_info],
+            photos=[photo] if photo else (),
+            documents=[resume] if resume else ()
+        )
+
+    # Files are uploaded once (to the first admin), the rest get the file_id.
+    # Admins who already got it on an earlier attempt are skipped.
+    uploads = (photo_path and not media_cache.get(photo_path)) or (resume_path and not media_cache.get(resume_path))
+    results = await notifier.deliver(
+        bot, [admin_id for admin_id in ADMIN_IDS if admin_id not in delivered], build,
+        on_sent=media_cache.remember_sent,
+        prime_first=bool(uploads)
+    )
+    delivered += [admin_id for admin_id, ok in results.items() if ok]
+    return all(results.values())
 
 
 @router.message(ApplicationState.confirmation, F.text)
@@ -174,10 +222,10 @@ async def process_confirmation(message: Message, state: FSMContext, user_lang: s
         app_id = await get_app_id(state)
         
         if is_confirm(message.text):
-            app = await DB.app.get(app_id)
-            await DB.app.submit(app_id)
-            
-            await send_to_admins(message, app)
+            # Admins are notified by the outbox worker once this update commits
+            if await DB.app.submit(app_id, notify=applicant_info(message)):
+                after_commit(outbox.wake)
+                after_commit(media_fetcher.wake)
             
             await state.clear()
             await state.update_data(lang=lang)
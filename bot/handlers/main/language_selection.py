@@ -35,7 +35,6 @@ async def language_selected(message: Message, state: FSMContext, db_user=None):
             reply_markup=Keyboards.main_menu(selected_lang)
         )
         await state.set_state(MenuState.main)
-        await DB.user.set_state(message.from_user.id, MenuState.main.state)
     except Exception as e:
         print(f"Error in language_selected: {e}")
         await message.answer(t("uz", "errors.general"))
\ No newline at end of file
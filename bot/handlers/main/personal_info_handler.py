@@ -21,7 +21,6 @@ async def process_first_name(message: Message, state: FSMContext, user_lang: str
         if is_back(message.text):
             await message.answer(t(lang, "menu.main"), reply_markup=Keyboards.main_menu(lang))
             await state.set_state(MenuState.main)
-            await DB.user.set_state(message.from_user.id, MenuState.main.state)
             return
         
         app_id = await get_app_id(state)
@@ -34,7 +33,6 @@ async def process_first_name(message: Message, state: FSMContext, user_lang: str
         await DB.app.set_first_name(app_id, cleaned)
         await message.answer(t(lang, "application.last_name.ask"), reply_markup=Keyboards.back(lang))
         await state.set_state(ApplicationState.last_name)
-        await DB.user.set_state(message.from_user.id, ApplicationState.last_name.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -48,7 +46,6 @@ async def process_last_name(message: Message, state: FSMContext, user_lang: str
         if is_back(message.text):
             await message.answer(t(lang, "application.first_name.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.first_name)
-            await DB.user.set_state(message.from_user.id, ApplicationState.first_name.state)
             return
         
         app_id = await get_app_id(state)
@@ -61,7 +58,6 @@ async def process_last_name(message: Message, state: FSMContext, user_lang: str
         await DB.app.set_last_name(app_id, cleaned)
         await message.answer(t(lang, "application.birth_date.ask"), reply_markup=Keyboards.back(lang))
         await state.set_state(ApplicationState.birth_date)
-        await DB.user.set_state(message.from_user.id, ApplicationState.birth_date.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -74,7 +70,6 @@ async def process_birth_date(message: Message, state: FSMContext, user_lang: str
         if is_back(message.text):
             await message.answer(t(lang, "application.last_name.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.last_name)
-            await DB.user.set_state(message.from_user.id, ApplicationState.last_name.state)
             return
         
         app_id = await get_app_id(state)
@@ -87,7 +82,6 @@ async def process_birth_date(message: Message, state: FSMContext, user_lang: str
         await DB.app.set_birth_date(app_id, birth_date)
         await message.answer(t(lang, "application.gender.ask"), reply_markup=Keyboards.gender(lang))
         await state.set_state(ApplicationState.gender)
-        await DB.user.set_state(message.from_user.id, ApplicationState.gender.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -101,7 +95,6 @@ async def process_gender(message: Message, state: FSMContext, user_lang: str = "
         if is_back(message.text):
             await message.answer(t(lang, "application.birth_date.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.birth_date)
-            await DB.user.set_state(message.from_user.id, ApplicationState.birth_date.state)
             return
         
         app_id = await get_app_id(state)
@@ -115,7 +108,6 @@ async def process_gender(message: Message, state: FSMContext, user_lang: str = "
         await DB.app.set_gender(app_id, GenderEnum(gender))
         await message.answer(t(lang, "application.address.ask"), reply_markup=Keyboards.back(lang))
         await state.set_state(ApplicationState.address)
-        await DB.user.set_state(message.from_user.id, ApplicationState.address.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -128,7 +120,6 @@ async def process_address(message: Message, state: FSMContext, user_lang: str =
         if is_back(message.text):
             await message.answer(t(lang, "application.gender.ask"), reply_markup=Keyboards.gender(lang))
             await state.set_state(ApplicationState.gender)
-            await DB.user.set_state(message.from_user.id, ApplicationState.gender.state)
             return
         
         app_id = await get_app_id(state)
@@ -141,7 +132,6 @@ async def process_address(message: Message, state: FSMContext, user_lang: str =
         await DB.app.set_address(app_id, cleaned)
         await message.answer(t(lang, "application.phone.ask"), reply_markup=Keyboards.phone(lang))
         await state.set_state(ApplicationState.phone)
-        await DB.user.set_state(message.from_user.id, ApplicationState.phone.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -159,7 +149,6 @@ async def process_phone_contact(message: Message, state: FSMContext, user_lang:
         await DB.app.set_phone(app_id, phone)
         await message.answer(t(lang, "application.email.ask"), reply_markup=Keyboards.skip_back(lang))
         await state.set_state(ApplicationState.email)
-        await DB.user.set_state(message.from_user.id, ApplicationState.email.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -173,7 +162,6 @@ async def process_phone_text(message: Message, state: FSMContext, user_lang: str
         if is_back(message.text):
             await message.answer(t(lang, "application.address.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.address)
-            await DB.user.set_state(message.from_user.id, ApplicationState.address.state)
             return
         
         app_id = await get_app_id(state)
@@ -186,7 +174,6 @@ async def process_phone_text(message: Message, state: FSMContext, user_lang: str
         await DB.app.set_phone(app_id, cleaned)
         await message.answer(t(lang, "application.email.ask"), reply_markup=Keyboards.skip_back(lang))
         await state.set_state(ApplicationState.email)
-        await DB.user.set_state(message.from_user.id, ApplicationState.email.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -199,13 +186,11 @@ async def process_email(message: Message, state: FSMContext, user_lang: str = "u
         if is_back(message.text):
             await message.answer(t(lang, "application.phone.ask"), reply_markup=Keyboards.phone(lang))
             await state.set_state(ApplicationState.phone)
-            await DB.user.set_state(message.from_user.id, ApplicationState.phone.state)
             return
         
         if is_skip(message.text):
             await message.answer(t(lang, "application.is_student.ask"), reply_markup=Keyboards.yes_no(lang))
             await state.set_state(ApplicationState.is_student)
-            await DB.user.set_state(message.from_user.id, ApplicationState.is_student.state)
             return
         
         app_id = await get_app_id(state)
@@ -218,6 +203,5 @@ async def process_email(message: Message, state: FSMContext, user_lang: str = "u
         await DB.app.update(app_id, email=cleaned)
         await message.answer(t(lang, "application.is_student.ask"), reply_markup=Keyboards.yes_no(lang))
         await state.set_state(ApplicationState.is_student)
-        await DB.user.set_state(message.from_user.id, ApplicationState.is_student.state)
     except Exception as e:
         print(f"Error: {e}")
\ No newline at end of file
@@ -9,6 +9,10 @@ from services.language_service import t
 from bot.validators.validator import is_back, is_skip
 from utils.helpers import get_app_id, get_lang
 from services.file_service import FileService
+from services.media_cache import media_cache
+from services.image_pipeline import image_pipeline
+from database.unit_of_work import after_commit
+from core.config import config
 
 router = Router(name="photo_handler")
 
@@ -19,9 +23,17 @@ async def process_photo(message: Message, state: FSMContext, user_lang: str = "u
         app_id = await get_app_id(state)
         
         photo = message.photo[-1]  
-        filepath = await FileService.download_photo(message.bot, photo, message.from_user.id)
+        if config.lazy_media:
+            # Only the file_id now - downloaded after the application is submitted
+            await DB.app.set_photo_file(app_id, photo.file_id, photo.file_unique_id)
+            filepath = None
+        else:
+            filepath = await FileService.download_photo(message.bot, photo, message.from_user.id)
         if filepath:
             await DB.app.set_photo(app_id, filepath)
+            media_cache.remember(filepath, photo.file_id)
+            # Resized in the background once the new photo_path is committed
+            after_commit(lambda: image_pipeline.submit(app_id, filepath))
         
         await message.answer(t(lang, "application.resume.ask"), reply_markup=Keyboards.skip_back(lang))
         await state.set_state(ApplicationState.resume)
@@ -60,9 +72,14 @@ async def process_resume(message: Message, state: FSMContext, user_lang: str = "
             await message.answer(t(lang, "application.resume.invalid"), reply_markup=Keyboards.skip_back(lang))
             return
         
-        filepath = await FileService.download_document(message.bot, doc, message.from_user.id)
+        if config.lazy_media:
+            await DB.app.set_resume_file(app_id, doc.file_id, doc.file_unique_id)
+            filepath = None
+        else:
+            filepath = await FileService.download_document(message.bot, doc, message.from_user.id)
         if filepath:
             await DB.app.set_resume(app_id, filepath)
+            media_cache.remember(filepath, doc.file_id)
         
         await message.answer(t(lang, "application.how_found.ask"), reply_markup=Keyboards.skip_back(lang))
         await state.set_state(ApplicationState.how_found)
@@ -27,7 +27,6 @@ async def settings_handler(message: Message, state: FSMContext, db_user=None, us
                 reply_markup=Keyboards.main_menu(lang)
             )
             await state.set_state(MenuState.main)
-            await DB.user.set_state(message.from_user.id, MenuState.main.state)
             return
         
         selected_lang = get_selected_lang(text)
@@ -41,7 +40,6 @@ async def settings_handler(message: Message, state: FSMContext, db_user=None, us
                 reply_markup=Keyboards.main_menu(selected_lang)
             )
             await state.set_state(MenuState.main)
-            await DB.user.set_state(message.from_user.id, MenuState.main.state)
         else:
             await message.answer(
                 t(lang, "menu.settings"),
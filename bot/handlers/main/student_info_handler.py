@@ -22,7 +22,6 @@ async def process_is_student(message: Message, state: FSMContext, user_lang: str
         if is_back(message.text):
             await message.answer(t(lang, "application.email.ask"), reply_markup=Keyboards.skip_back(lang))
             await state.set_state(ApplicationState.email)
-            await DB.user.set_state(message.from_user.id, ApplicationState.email.state)
             return
         
         app_id = await get_app_id(state)
@@ -32,13 +31,11 @@ async def process_is_student(message: Message, state: FSMContext, user_lang: str
             await state.update_data(is_student=True)
             await message.answer(t(lang, "application.education_place.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.education_place)
-            await DB.user.set_state(message.from_user.id, ApplicationState.education_place.state)
         elif is_no(message.text):
             await DB.app.set_is_student(app_id, False)
             await state.update_data(is_student=False)
             await message.answer(t(lang, "application.has_experience.ask"), reply_markup=Keyboards.yes_no(lang))
             await state.set_state(ApplicationState.has_experience)
-            await DB.user.set_state(message.from_user.id, ApplicationState.has_experience.state)
         else:
             await message.answer(t(lang, "application.is_student.ask"), reply_markup=Keyboards.yes_no(lang))
     except Exception as e:
@@ -53,7 +50,6 @@ async def process_education_place(message: Message, state: FSMContext, user_lang
         if is_back(message.text):
             await message.answer(t(lang, "application.is_student.ask"), reply_markup=Keyboards.yes_no(lang))
             await state.set_state(ApplicationState.is_student)
-            await DB.user.set_state(message.from_user.id, ApplicationState.is_student.state)
             return
         
         is_valid, cleaned = Validators.text_field(message.text)
@@ -66,7 +62,6 @@ async def process_education_place(message: Message, state: FSMContext, user_lang
         await DB.app.update(app_id, education_place=cleaned)
         await message.answer(t(lang, "application.education_level.ask"), reply_markup=Keyboards.language_level(lang))
         await state.set_state(ApplicationState.education_level)
-        await DB.user.set_state(message.from_user.id, ApplicationState.education_level.state)
     except Exception as e:
         print(f"Error: {e}")
 
@@ -79,7 +74,6 @@ async def process_education_level(message: Message, state: FSMContext, user_lang
         if is_back(message.text):
             await message.answer(t(lang, "application.education_place.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.education_place)
-            await DB.user.set_state(message.from_user.id, ApplicationState.education_place.state)
             return
         
         level = get_level(message.text)
@@ -92,6 +86,5 @@ async def process_education_level(message: Message, state: FSMContext, user_lang
         await DB.app.update(app_id, education_level=LevelEnum(level))
         await message.answer(t(lang, "application.has_experience.ask"), reply_markup=Keyboards.yes_no(lang))
         await state.set_state(ApplicationState.has_experience)
-        await DB.user.set_state(message.from_user.id, ApplicationState.has_experience.state)
     except Exception as e:
         print(f"Error: {e}")
\ No newline at end of file
@@ -21,7 +21,6 @@ async def process_has_experience(message: Message, state: FSMContext, user_lang:
         if is_back(message.text):
             await message.answer(t(lang, "application.education_level.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.education_level)
-            await DB.user.set_state(message.from_user.id, ApplicationState.education_level.state)
             return
         
         app_id = await get_app_id(state)
@@ -33,6 +32,7 @@ async def process_has_experience(message: Message, state: FSMContext, user_lang:
             await state.set_state(ApplicationState.experience_years)
         elif is_no(message.text):
             await DB.app.update(app_id, has_work_experience=False)
+            await DB.app.flush(app_id)
             await state.update_data(has_experience=False)
             await message.answer(t(lang, "application.photo.ask"), reply_markup=Keyboards.back(lang))
             await state.set_state(ApplicationState.photo)
@@ -106,6 +106,7 @@ async def process_last_position(message: Message, state: FSMContext, user_lang:
         
         app_id = await get_app_id(state)
         await DB.app.update(app_id, last_position=cleaned)
+        await DB.app.flush(app_id)
         await message.answer(t(lang, "application.photo.ask"), reply_markup=Keyboards.back(lang))
         await state.set_state(ApplicationState.photo)
     except Exception as e:
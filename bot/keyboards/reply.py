@@ -1,124 +1,227 @@
 """
 🎹 Fixed Keyboard Builders
 """
+from typing import Callable, Optional
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
 from aiogram.utils.keyboard import ReplyKeyboardBuilder
-from services.language_service import btn
+from services.language_service import btn, get_lang_service
 
+DEFAULT_LANG = "uz"
+
+
+# ==================== BUILDERS ====================
+
+def _language_select(lang: str) -> ReplyKeyboardMarkup:
+    """Language selection - always same buttons"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(
+        KeyboardButton(text="🇺🇿 O'zbekcha"),
+        KeyboardButton(text="🇷🇺 Русский"),
+        KeyboardButton(text="🇬🇧 English")
+    )
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _main_menu(lang: str) -> ReplyKeyboardMarkup:
+    """Main menu"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(KeyboardButton(text=btn(lang, "start_application")))
+    builder.row(KeyboardButton(text=btn(lang, "settings")))
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _settings(lang: str) -> ReplyKeyboardMarkup:
+    """Settings with language options"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(
+        KeyboardButton(text="🇺🇿 O'zbekcha"),
+        KeyboardButton(text="🇷🇺 Русский"),
+        KeyboardButton(text="🇬🇧 English")
+    )
+    builder.row(KeyboardButton(text=btn(lang, "back")))
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _back(lang: str) -> ReplyKeyboardMarkup:
+    """Back button only"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(KeyboardButton(text=btn(lang, "back")))
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _skip_back(lang: str) -> ReplyKeyboardMarkup:
+    """Skip and back buttons"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(
+        KeyboardButton(text=btn(lang, "skip")),
+        KeyboardButton(text=btn(lang, "back"))
+    )
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _gender(lang: str) -> ReplyKeyboardMarkup:
+    """Gender selection"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(
+        KeyboardButton(text=btn(lang, "male")),
+        KeyboardButton(text=btn(lang, "female"))
+    )
+    builder.row(KeyboardButton(text=btn(lang, "back")))
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _yes_no(lang: str) -> ReplyKeyboardMarkup:
+    """Yes/No selection"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(
+        KeyboardButton(text=btn(lang, "yes")),
+        KeyboardButton(text=btn(lang, "no"))
+    )
+    builder.row(KeyboardButton(text=btn(lang, "back")))
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _phone(lang: str) -> ReplyKeyboardMarkup:
+    """Phone with contact button"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(KeyboardButton(text=btn(lang, "send_phone"), request_contact=True))
+    builder.row(KeyboardButton(text=btn(lang, "back")))
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _language_level(lang: str) -> ReplyKeyboardMarkup:
+    """Language proficiency levels"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(
+        KeyboardButton(text=btn(lang, "secondary")),
+        KeyboardButton(text=btn(lang, "specialized_secondary"))
+    )
+    builder.row(
+        KeyboardButton(text=btn(lang, "incomplete_higher")),
+        KeyboardButton(text=btn(lang, "bachelor"))
+    )
+    builder.row(
+        KeyboardButton(text=btn(lang, "master"))
+    )
+    builder.row(
+        KeyboardButton(text=btn(lang, "back"))
+    )
+    return builder.as_markup(resize_keyboard=True)
+
+
+def _confirmation(lang: str) -> ReplyKeyboardMarkup:
+    """Confirm/Refill/Cancel"""
+    builder = ReplyKeyboardBuilder()
+    builder.row(KeyboardButton(text=btn(lang, "confirm")))
+    builder.row(
+        KeyboardButton(text=btn(lang, "refill")),
+        KeyboardButton(text=btn(lang, "cancel"))
+    )
+    return builder.as_markup(resize_keyboard=True)
+
+
+BUILDERS: dict[str, Callable[[str], ReplyKeyboardMarkup]] = {
+    "language_select": _language_select,
+    "main_menu": _main_menu,
+    "settings": _settings,
+    "back": _back,
+    "skip_back": _skip_back,
+    "gender": _gender,
+    "yes_no": _yes_no,
+    "phone": _phone,
+    "language_level": _language_level,
+    "confirmation": _confirmation,
+}
+
+_REMOVE = ReplyKeyboardRemove()
+
+
+# ==================== CACHE ====================
 
 class Keyboards:
-    """Keyboard builder with proper language support"""
-    
+    """
+    Keyboard builder with proper language support
+
+    Every keyboard is built once per language and shared - aiogram markups
+    are frozen pydantic models, so handing out the same object is safe.
+    rebuild() swaps in a fresh set (e.g. after the catalogs change).
+    """
+
+    _cache: dict[tuple[str, str], ReplyKeyboardMarkup] = {}
+    # id(markup) -> (markup, request JSON) - filled by CachedMarkupSession
+    _json: dict[int, tuple[ReplyKeyboardMarkup, Optional[str]]] = {}
+
+    @classmethod
+    def rebuild(cls) -> None:
+        """Build every keyboard for every loaded language"""
+        langs = get_lang_service().languages() or (DEFAULT_LANG,)
+        cache = {(name, lang): build(lang) for name, build in BUILDERS.items() for lang in langs}
+        cls._json = {id(markup): (markup, None) for markup in cache.values()}
+        cls._cache = cache
+
+    @classmethod
+    def get(cls, name: str, lang: str) -> ReplyKeyboardMarkup:
+        markup = cls._cache.get((name, lang))
+        if markup is None:
+            markup = cls._cache.get((name, DEFAULT_LANG))
+            if markup is None:
+                cls.rebuild()
+                markup = cls._cache.get((name, lang)) or cls._cache[(name, DEFAULT_LANG)]
+        return markup
+
+    @classmethod
+    def cached_json(cls, markup) -> Optional[str]:
+        item = cls._json.get(id(markup))
+        if item is not None and item[0] is markup:
+            return item[1]
+        return None
+
+    @classmethod
+    def remember_json(cls, markup, dumped: str) -> None:
+        item = cls._json.get(id(markup))
+        if item is not None and item[0] is markup:
+            cls._json[id(markup)] = (markup, dumped)
+
     @staticmethod
     def remove() -> ReplyKeyboardRemove:
-        return ReplyKeyboardRemove()
-    
+        return _REMOVE
+
     @staticmethod
     def language_select() -> ReplyKeyboardMarkup:
-        """Language selection - always same buttons"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(
-            KeyboardButton(text="🇺🇿 O'zbekcha"),
-            KeyboardButton(text="🇷🇺 Русский"),
-            KeyboardButton(text="🇬🇧 English")
-        )
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("language_select", DEFAULT_LANG)
+
     @staticmethod
     def main_menu(lang: str) -> ReplyKeyboardMarkup:
-        """Main menu"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(KeyboardButton(text=btn(lang, "start_application")))
-        builder.row(KeyboardButton(text=btn(lang, "settings")))
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("main_menu", lang)
+
     @staticmethod
     def settings(lang: str) -> ReplyKeyboardMarkup:
-        """Settings with language options"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(
-            KeyboardButton(text="🇺🇿 O'zbekcha"),
-            KeyboardButton(text="🇷🇺 Русский"),
-            KeyboardButton(text="🇬🇧 English")
-        )
-        builder.row(KeyboardButton(text=btn(lang, "back")))
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("settings", lang)
+
     @staticmethod
     def back(lang: str) -> ReplyKeyboardMarkup:
-        """Back button only"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(KeyboardButton(text=btn(lang, "back")))
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("back", lang)
+
     @staticmethod
     def skip_back(lang: str) -> ReplyKeyboardMarkup:
-        """Skip and back buttons"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(
-            KeyboardButton(text=btn(lang, "skip")),
-            KeyboardButton(text=btn(lang, "back"))
-        )
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("skip_back", lang)
+
     @staticmethod
     def gender(lang: str) -> ReplyKeyboardMarkup:
-        """Gender selection"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(
-            KeyboardButton(text=btn(lang, "male")),
-            KeyboardButton(text=btn(lang, "female"))
-        )
-        builder.row(KeyboardButton(text=btn(lang, "back")))
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("gender", lang)
+
     @staticmethod
     def yes_no(lang: str) -> ReplyKeyboardMarkup:
-        """Yes/No selection"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(
-            KeyboardButton(text=btn(lang, "yes")),
-            KeyboardButton(text=btn(lang, "no"))
-        )
-        builder.row(KeyboardButton(text=btn(lang, "back")))
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("yes_no", lang)
+
     @staticmethod
     def phone(lang: str) -> ReplyKeyboardMarkup:
-        """Phone with contact button"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(KeyboardButton(text=btn(lang, "send_phone"), request_contact=True))
-        builder.row(KeyboardButton(text=btn(lang, "back")))
-        return builder.as_markup(resize_keyboard=True)
-    
+        return Keyboards.get("phone", lang)
+
     @staticmethod
     def language_level(lang: str) -> ReplyKeyboardMarkup:
-        """Language proficiency levels"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(
-            KeyboardButton(text=btn(lang, "secondary")),
-            KeyboardButton(text=btn(lang, "specialized_secondary"))
-        )
-        builder.row(
-            KeyboardButton(text=btn(lang, "incomplete_higher")),
-            KeyboardButton(text=btn(lang, "bachelor"))
-        )
-        builder.row(
-            KeyboardButton(text=btn(lang, "master"))
-        )
-        builder.row(
-            KeyboardButton(text=btn(lang, "back"))
-        )
-        return builder.as_markup(resize_keyboard=True)
-
-    
+        return Keyboards.get("language_level", lang)
+
     @staticmethod
     def confirmation(lang: str) -> ReplyKeyboardMarkup:
-        """Confirm/Refill/Cancel"""
-        builder = ReplyKeyboardBuilder()
-        builder.row(KeyboardButton(text=btn(lang, "confirm")))
-        builder.row(
-            KeyboardButton(text=btn(lang, "refill")),
-            KeyboardButton(text=btn(lang, "cancel"))
-        )
-        return builder.as_markup(resize_keyboard=True)
\ No newline at end of file
+        return Keyboards.get("confirmation", lang)
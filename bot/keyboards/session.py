@@ -0,0 +1,28 @@
+"""
+Bot session that reuses the request JSON of cached keyboards
+"""
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.types import ReplyKeyboardMarkup
+
+from bot.keyboards.reply import Keyboards
+
+
+class CachedMarkupSession(AiohttpSession):
+    """
+    Serializes each shared keyboard once
+
+    Keyboards hands out the same markup object per (keyboard, language),
+    so its JSON is produced on the first send and reused afterwards.
+    """
+
+    def prepare_value(self, value: Any, bot: Bot, files: dict[str, Any], _dumps_json: bool = True) -> Any:
+        if _dumps_json and isinstance(value, ReplyKeyboardMarkup):
+            dumped = Keyboards.cached_json(value)
+            if dumped is None:
+                dumped = super().prepare_value(value, bot, files, _dumps_json)
+                Keyboards.remember_json(value, dumped)
+            return dumped
+        return super().prepare_value(value, bot, files, _dumps_json)
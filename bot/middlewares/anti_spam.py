@@ -1,25 +1,22 @@
-from typing import Callable, Dict, Any, Awaitable
+from typing import Callable, Dict, Any, Awaitable, Optional
 from aiogram import BaseMiddleware
-from aiogram.types import Message
-import re
+from aiogram.types import TelegramObject
+
+from services.spam_filter import SpamFilter, spam_filter as default_spam_filter
 
 
 class AntiSpamMiddleware(BaseMiddleware):
-    SPAM_PATTERNS = [
-        r'[@&₽)\$€£¥₹]{3,}', 
-        r'[₽₴₸₹₺]{2,}',      
-        r'[@#$%^&*]{5,}',     
-    ]
-    
+    def __init__(self, spam_filter: Optional[SpamFilter] = None):
+        self.spam_filter = spam_filter or default_spam_filter
+
     async def __call__(
         self,
-        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
-        event: Message,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
         data: Dict[str, Any]
     ) -> Any:
-        if event.text:
-            for pattern in self.SPAM_PATTERNS:
-                if re.search(pattern, event.text):
-                    return  
-        
-        return await handler(event, data)
\ No newline at end of file
+        text = getattr(event, "text", None)
+        if text and self.spam_filter.match(text):
+            return
+
+        return await handler(event, data)
@@ -19,22 +19,12 @@ class AuthMiddleware(BaseMiddleware):
             user = event.from_user
 
         if user and not user.is_bot:
-            db_user, created = await DB.user.get_or_create(
+            db_user, created = await DB.user.upsert_profile(
                 user_id=user.id,
                 first_name=user.first_name,
                 last_name=user.last_name,
                 username=user.username,
             )
-            if not created:
-                if (db_user.first_name != user.first_name or
-                    db_user.last_name != user.last_name or
-                    db_user.username != user.username):
-                    await DB.user.sync_telegram(
-                        user_id=user.id,
-                        first_name=user.first_name,
-                        last_name=user.last_name,
-                        username=user.username
-                    )
 
             data["db_user"] = db_user
             data["is_new_user"] = created
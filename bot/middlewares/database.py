@@ -0,0 +1,50 @@
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+from aiogram.types import TelegramObject
+
+from database.unit_of_work import UnitOfWork, checkpoint
+
+
+class DatabaseMiddleware(BaseMiddleware):
+    """
+    One session / transaction per update
+
+    Must be registered before any middleware that touches the DB (AuthMiddleware).
+    The session is available to handlers as `session`, and DB.* calls reuse it.
+
+    The transaction must not stay open while a handler waits on Telegram -
+    on SQLite that would hold the write lock over network I/O and stall
+    every other update. CommitBeforeRequest commits it before each Bot API
+    call, so an update is atomic only up to its first send.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        async with UnitOfWork() as session:
+            data["session"] = session
+            return await handler(event, data)
+
+
+class CommitBeforeRequest(BaseRequestMiddleware):
+    """
+    Bot session middleware - checkpoints the handler's unit of work before any API call
+
+    Usage:
+        bot.session.middleware(CommitBeforeRequest())
+    """
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        await checkpoint()
+        return await make_request(bot, method)
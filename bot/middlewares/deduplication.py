@@ -0,0 +1,22 @@
+from typing import Callable, Dict, Any, Awaitable
+from aiogram import BaseMiddleware
+from aiogram.types import Update
+
+from services.update_dedup import UpdateDeduplicator
+
+
+class DeduplicationMiddleware(BaseMiddleware):
+    """Drops updates whose update_id was already handled (outer middleware on dp.update)"""
+
+    def __init__(self, dedup: UpdateDeduplicator):
+        self.dedup = dedup
+
+    async def __call__(
+        self,
+        handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        if not await self.dedup.is_new(event.update_id):
+            return None
+        return await handler(event, data)
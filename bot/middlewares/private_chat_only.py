@@ -1,23 +1,31 @@
 from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
-from aiogram.types import Message
+from aiogram.types import Message, CallbackQuery, TelegramObject
 from aiogram.enums import ChatType
 
 
 class PrivateChatOnlyMiddleware(BaseMiddleware):
     async def __call__(
         self,
-        handler: Callable[[Message, Dict[str, Any]], Awaitable[Any]],
-        event: Message,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
         data: Dict[str, Any]
     ) -> Any:
-        if event.chat.type != ChatType.PRIVATE:
-            print(f"[PrivateChatOnly] Blocked {event.chat.type} chat: {event.chat.id}")
+        if isinstance(event, CallbackQuery):
+            chat = event.message.chat if event.message else None
+        else:
+            chat = getattr(event, "chat", None)
+
+        if chat is not None and chat.type != ChatType.PRIVATE:
+            print(f"[PrivateChatOnly] Blocked {chat.type} chat: {chat.id}")
             try:
-                await event.answer("❌ This bot only works in private chats.")
-                await event.bot.leave_chat(event.chat.id)
+                if isinstance(event, Message):
+                    await event.answer("❌ This bot only works in private chats.")
+                else:
+                    await event.answer()
+                await event.bot.leave_chat(chat.id)
             except:
                 pass
             
             return 
-        return await handler(event, data)
\ No newline at end of file
+        return await handler(event, data)
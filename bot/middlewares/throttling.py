@@ -4,11 +4,11 @@ Using limitless-py style: @ratelimit(calls=3, per=2)
 
 pip install limitless-py
 """
-from typing import Callable, Dict, Any, Awaitable, Optional
+from typing import Callable, Dict, Any, Awaitable, Optional, Union
 from aiogram import BaseMiddleware
 from aiogram.types import Message, CallbackQuery, TelegramObject
-from collections import defaultdict
-import time
+
+from services.rate_limiter import GCRALimiter, RedisGCRALimiter
 
 
 class ThrottlingMiddleware(BaseMiddleware):
@@ -27,16 +27,25 @@ class ThrottlingMiddleware(BaseMiddleware):
             per=2,
             warning_message="⏳ Iltimos, sekinroq yozing!"
         ))
+
+        # Shared between uvicorn workers
+        dp.message.middleware(ThrottlingMiddleware(
+            calls=3,
+            per=2,
+            limiter=RedisGCRALimiter(redis, calls=3, per=2)
+        ))
     """
 
-    __slots__ = ("calls", "per", "warning_message", "silent", "_user_calls")
+    __slots__ = ("calls", "per", "warning_message", "silent", "_limiter")
 
     def __init__(
         self,
         calls: int = 1,
         per: float = 0.5,
         warning_message: Optional[str] = None,
-        silent: bool = False
+        silent: bool = False,
+        max_users: int = 100_000,
+        limiter: Optional[Union[GCRALimiter, RedisGCRALimiter]] = None
     ):
         """
         Args:
@@ -44,26 +53,19 @@ class ThrottlingMiddleware(BaseMiddleware):
             per: Time period in seconds
             warning_message: Message to send when rate limited
             silent: If True, silently drop spam without warning
+            max_users: Hard cap on users tracked in memory
+            limiter: Backend with `async acquire(user_id) -> bool`,
+                in-process GCRALimiter by default
         """
         self.calls = calls
         self.per = per
         self.warning_message = warning_message
         self.silent = silent
-        self._user_calls: Dict[int, list] = defaultdict(list)
-
-    def _is_allowed(self, user_id: int) -> bool:
-        """Check if user is allowed (limitless-py logic)"""
-        now = time.time()
-        timestamps = self._user_calls[user_id]
-
-        window_start = now - self.per
-        timestamps[:] = [ts for ts in timestamps if ts > window_start]
-
-        if len(timestamps) < self.calls:
-            timestamps.append(now)
-            return True
+        self._limiter = limiter or GCRALimiter(calls=calls, per=per, max_keys=max_users)
 
-        return False
+    async def _is_allowed(self, user_id: int) -> bool:
+        """Check if user is allowed - O(1) in memory, one round-trip with Redis"""
+        return await self._limiter.acquire(user_id)
 
     async def __call__(
         self,
@@ -75,7 +77,7 @@ class ThrottlingMiddleware(BaseMiddleware):
         if not user or user.is_bot:
             return await handler(event, data)
 
-        if not self._is_allowed(user.id):
+        if not await self._is_allowed(user.id):
             # Rate limited
             if not self.silent and self.warning_message:
                 if isinstance(event, Message):
@@ -0,0 +1,3 @@
+"""
+bot.storage
+"""
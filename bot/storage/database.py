@@ -0,0 +1,165 @@
+"""
+FSM storage backed by the user table
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Mapping, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType, DEFAULT_DESTINY
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from database.config import async_session
+from database.repositories.user_repository import UserRepo
+
+logger = logging.getLogger(__name__)
+
+
+class _Record:
+    __slots__ = ("state", "data", "loaded_at")
+
+    def __init__(self, state: Optional[str], data: dict[str, Any], loaded_at: float):
+        self.state = state
+        self.data = data
+        self.loaded_at = loaded_at
+
+
+class DatabaseStorage(BaseStorage):
+    """
+    Persists FSM state in user.state / user.state_data
+
+    - reads are served from an in-process cache (refreshed after cache_ttl)
+    - writes go to the cache at once and reach the DB in batches every
+      flush_interval seconds (and on close), one executemany per batch
+
+    The cache is per process: with several webhook workers use RedisStorage,
+    or make sure updates of one user always reach the same worker.
+    Group chats, threads and custom destinies are kept in memory only.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        cache_ttl: float = 300.0,
+        max_cached: int = 50_000
+    ):
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self.max_cached = max_cached
+        self._cache: dict[int, _Record] = {}
+        self._dirty: set[int] = set()
+        self._fallback = MemoryStorage()
+        self._flusher: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _persistent(key: StorageKey) -> bool:
+        return (
+            key.chat_id == key.user_id
+            and key.thread_id is None
+            and key.business_connection_id is None
+            and key.destiny == DEFAULT_DESTINY
+        )
+
+    async def _record(self, user_id: int) -> _Record:
+        now = time.monotonic()
+        record = self._cache.get(user_id)
+        if record is not None and (user_id in self._dirty or now - record.loaded_at < self.cache_ttl):
+            return record
+
+        async with async_session() as s:
+            state, data = await UserRepo.get_state_with_data(s, user_id)
+        # Column default / legacy values ("language_select", "idle") are not FSM states
+        if state and ":" not in state:
+            state = None
+
+        record = self._cache.get(user_id)
+        if record is not None and user_id in self._dirty:
+            # Written while we were loading - keep the newer value
+            return record
+        record = _Record(state, data or {}, now)
+        self._cache.pop(user_id, None)
+        self._cache[user_id] = record
+        if len(self._cache) > self.max_cached:
+            self._evict()
+        return record
+
+    def _evict(self) -> None:
+        """Drop the oldest clean entries"""
+        excess = len(self._cache) - self.max_cached * 9 // 10
+        for user_id in list(self._cache):
+            if excess <= 0:
+                break
+            if user_id not in self._dirty:
+                del self._cache[user_id]
+                excess -= 1
+
+    def _mark_dirty(self, user_id: int) -> None:
+        self._dirty.add(user_id)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        # Keeps running while writes arrive during a flush or a flush fails
+        while self._dirty:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"FSM state flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Write all changed states to the DB"""
+        if not self._dirty:
+            return
+        dirty, self._dirty = self._dirty, set()
+        batch = {}
+        for user_id in dirty:
+            record = self._cache.get(user_id)
+            if record is not None:
+                batch[user_id] = (record.state, record.data)
+        try:
+            # Own session on purpose - never part of a handler's unit of work
+            async with async_session() as s:
+                await UserRepo.set_states(s, batch)
+        except BaseException:
+            self._dirty |= dirty
+            raise
+
+    # ==================== BaseStorage ====================
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        if not self._persistent(key):
+            return await self._fallback.set_state(key, state)
+        record = await self._record(key.user_id)
+        record.state = state.state if isinstance(state, State) else state
+        self._mark_dirty(key.user_id)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        if not self._persistent(key):
+            return await self._fallback.get_state(key)
+        return (await self._record(key.user_id)).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not self._persistent(key):
+            return await self._fallback.set_data(key, data)
+        record = await self._record(key.user_id)
+        record.data = dict(data)
+        self._mark_dirty(key.user_id)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        if not self._persistent(key):
+            return await self._fallback.get_data(key)
+        return dict((await self._record(key.user_id)).data)
+
+    async def close(self) -> None:
+        """Stop the pending timer and write everything that is left"""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await self._fallback.close()
@@ -0,0 +1,85 @@
+"""
+user.state as a projection of another FSM storage
+"""
+import asyncio
+import logging
+from typing import Any, Mapping, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType, DEFAULT_DESTINY
+
+from database.config import async_session
+from database.repositories.user_repository import UserRepo
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectedStorage(BaseStorage):
+    """
+    Delegates to `storage` and mirrors private-chat states into user.state
+
+    Used on top of RedisStorage: handlers only call state.set_state(), and
+    user.state follows in batches every flush_interval seconds - never as an
+    extra UPDATE on the handler's path.
+    """
+
+    def __init__(self, storage: BaseStorage, flush_interval: float = 5.0):
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self._pending: dict[int, Optional[str]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self.storage.set_state(key, state)
+        if (
+            key.chat_id == key.user_id
+            and key.thread_id is None
+            and key.business_connection_id is None
+            and key.destiny == DEFAULT_DESTINY
+        ):
+            self._pending[key.user_id] = state.state if isinstance(state, State) else state
+            if self._flusher is None or self._flusher.done():
+                self._flusher = asyncio.create_task(self._flush_later())
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self.storage.get_state(key)
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        await self.storage.set_data(key, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return await self.storage.get_data(key)
+
+    async def update_data(self, key: StorageKey, data: Mapping[str, Any]) -> dict[str, Any]:
+        return await self.storage.update_data(key, data)
+
+    async def _flush_later(self) -> None:
+        while self._pending:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"user.state projection flush failed: {e}")
+
+    async def flush(self) -> None:
+        """Write pending states to user.state"""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        try:
+            async with async_session() as s:
+                await UserRepo.set_state_many(s, batch)
+        except BaseException:
+            self._pending = {**batch, **self._pending}
+            raise
+
+    async def close(self) -> None:
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            try:
+                await flusher
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await self.storage.close()
@@ -2,7 +2,7 @@
 import re
 from datetime import date
 from typing import Tuple, Optional
-from services.language_service import btn
+from services.language_service import match_button
 
 class Validators:
     PHONE_PATTERN = re.compile(r"^\+?998[0-9]{9}$")
@@ -73,84 +73,64 @@ class Validators:
             return False, 0
 
 
-# Dynamic button matchers - pulls directly from YAML
-def _get_buttons(key: str) -> list:
-    """Get button text for all languages from YAML"""
-    return [btn("uz", key), btn("ru", key), btn("en", key)]
+# Button matchers - one lookup in the button index built from YAML
+GENDERS = frozenset({"male", "female"})
+LEVELS = frozenset({"secondary", "specialized_secondary", "incomplete_higher", "bachelor", "master"})
+LANGUAGES = frozenset({"uz", "ru", "en"})
+
+
+def button_key(text: str) -> Optional[str]:
+    """Button key ("back", "male", ...) of a text in any language"""
+    match = match_button(text) if text else None
+    return match[0] if match else None
+
+
+def button_lang(text: str) -> Optional[str]:
+    """Language of the keyboard the button was pressed on"""
+    match = match_button(text) if text else None
+    return match[1] if match else None
 
 
 def is_back(text: str) -> bool:
-    return text in _get_buttons("back")
+    return button_key(text) == "back"
 
 
 def is_skip(text: str) -> bool:
-    return text in _get_buttons("skip")
+    return button_key(text) == "skip"
 
 
 def is_yes(text: str) -> bool:
-    return text in _get_buttons("yes")
+    return button_key(text) == "yes"
 
 
 def is_no(text: str) -> bool:
-    return text in _get_buttons("no")
+    return button_key(text) == "no"
 
 
 def is_confirm(text: str) -> bool:
-    return text in _get_buttons("confirm")
+    return button_key(text) == "confirm"
 
 
 def is_refill(text: str) -> bool:
-    return text in _get_buttons("refill")
+    return button_key(text) == "refill"
 
 
 def is_cancel(text: str) -> bool:
-    return text in _get_buttons("cancel")
+    return button_key(text) == "cancel"
 
 
 def get_gender(text: str) -> Optional[str]:
-    gender_map = {
-        btn("uz", "male"): "male", btn("ru", "male"): "male", btn("en", "male"): "male",
-        btn("uz", "female"): "female", btn("ru", "female"): "female", btn("en", "female"): "female",
-    }
-    return gender_map.get(text)
+    key = button_key(text)
+    return key if key in GENDERS else None
 
 
 def get_level(text: str) -> Optional[str]:
     """Get education level for Uzbekistan system"""
-    level_map = {
-        # O'rta (Secondary)
-        btn("uz", "secondary"): "secondary",
-        btn("ru", "secondary"): "secondary", 
-        btn("en", "secondary"): "secondary",
-        
-        # O'rta maxsus (Specialized secondary - college/vocational)
-        btn("uz", "specialized_secondary"): "specialized_secondary",
-        btn("ru", "specialized_secondary"): "specialized_secondary",
-        btn("en", "specialized_secondary"): "specialized_secondary",
-        
-        # Oliy to'liqsiz (Incomplete higher - bachelor in progress)
-        btn("uz", "incomplete_higher"): "incomplete_higher",
-        btn("ru", "incomplete_higher"): "incomplete_higher",
-        btn("en", "incomplete_higher"): "incomplete_higher",
-        
-        # Oliy (Higher - bachelor's degree)
-        btn("uz", "bachelor"): "bachelor",
-        btn("ru", "bachelor"): "bachelor",
-        btn("en", "bachelor"): "bachelor",
-        
-        # Magistratura (Master's)
-        btn("uz", "master"): "master",
-        btn("ru", "master"): "master",
-        btn("en", "master"): "master",
-    }
-    return level_map.get(text)
+    key = button_key(text)
+    return key if key in LEVELS else None
 
 
 def get_selected_lang(text: str) -> Optional[str]:
     """Get language code from button text"""
-    lang_map = {
-        btn("uz", "uz"): "uz",
-        btn("ru", "ru"): "ru",
-        btn("en", "en"): "en",
-    }
-    return lang_map.get(text)
\ No newline at end of file
+    key = button_key(text)
+    return key if key in LANGUAGES else None
@@ -14,6 +14,15 @@ class Config:
     bot_token: str
     database_url: str
     admin_ids: list[int]
+    redis_url: str = ""
+    write_behind: bool = False
+    write_behind_interval: float = 5.0
+    update_workers: int = 8
+    update_queue_size: int = 1000
+    lazy_media: bool = False
+    lang_watch_interval: float = 0
+    spam_rules: str = ""
+    spam_min_length: int = 2
     
     @classmethod
     def from_env(cls):
@@ -21,7 +30,16 @@ class Config:
         return cls(
             bot_token=os.getenv("BOT_TOKEN", ""),
             database_url=os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./bot_database.db"),
-            admin_ids=[int(id) for id in os.getenv("ADMIN_IDS", "").split(",") if id]
+            admin_ids=[int(id) for id in os.getenv("ADMIN_IDS", "").split(",") if id],
+            redis_url=os.getenv("REDIS_URL", ""),
+            write_behind=os.getenv("WRITE_BEHIND", "0").lower() in ("1", "true", "yes"),
+            write_behind_interval=float(os.getenv("WRITE_BEHIND_INTERVAL", "5")),
+            update_workers=int(os.getenv("UPDATE_WORKERS", "8")),
+            update_queue_size=int(os.getenv("UPDATE_QUEUE_SIZE", "1000")),
+            lazy_media=os.getenv("LAZY_MEDIA", "0").lower() in ("1", "true", "yes"),
+            lang_watch_interval=float(os.getenv("LANG_WATCH_INTERVAL", "0")),
+            spam_rules=os.getenv("SPAM_RULES", ""),
+            spam_min_length=int(os.getenv("SPAM_MIN_LENGTH", "2")),
         )
 
 config = Config.from_env()
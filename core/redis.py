@@ -0,0 +1,26 @@
+"""
+Shared Redis connection (optional)
+"""
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from core.config import config
+
+_redis: Optional[Redis] = None
+
+
+def get_redis() -> Optional[Redis]:
+    """Redis client for REDIS_URL, or None when Redis is not configured"""
+    global _redis
+    if _redis is None and config.redis_url:
+        _redis = Redis.from_url(config.redis_url)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared connection pool"""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
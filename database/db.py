@@ -4,8 +4,12 @@ One import, all operations
 """
 from typing import Optional, Any
 from datetime import date
+from collections import Counter
 
 from database.config import async_session
+from database.unit_of_work import session_scope
+from database.write_behind import app_buffer
+from database.user_cache import user_cache, UserProfile
 from database.repositories.user_repository import UserRepo
 from database.repositories.application_repository import ApplicationRepo
 from database.models.enums.application_status import ApplicationStatusEnum, GenderEnum, LevelEnum
@@ -18,6 +22,9 @@ class DB:
     Usage:
         await DB.user.get_state(user_id)
         await DB.app.set_first_name(app_id, "John")
+
+    Inside a UnitOfWork (see DatabaseMiddleware) every call shares the
+    update's session and is committed once at the end of the handler.
     """
 
     class user:
@@ -26,159 +33,175 @@ class DB:
         # ===== CREATE =====
         @staticmethod
         async def create(user_id: int, first_name: str, last_name: str = None, username: str = None):
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.create(s, user_id, first_name, last_name, username)
 
         @staticmethod
         async def get_or_create(user_id: int, first_name: str, last_name: str = None, username: str = None):
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_or_create(s, user_id, first_name, last_name, username)
 
+        @staticmethod
+        async def upsert_profile(
+                user_id: int, first_name: str, last_name: str = None, username: str = None
+        ) -> tuple[UserProfile, bool]:
+            """Register / sync Telegram names - cached, at most one round-trip"""
+            profile = user_cache.get(user_id)
+            if (profile is not None and
+                    profile.first_name == first_name and
+                    profile.last_name == last_name and
+                    profile.username == username):
+                return profile, False
+            async with session_scope() as s:
+                profile, created = await UserRepo.upsert(s, user_id, first_name, last_name, username)
+            user_cache.put_committed(profile)
+            return profile, created
+
         # ===== READ =====
         @staticmethod
         async def get(user_id: int):
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get(s, user_id)
 
         @staticmethod
         async def exists(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.exists(s, user_id)
 
         @staticmethod
         async def get_username(user_id: int) -> Optional[str]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_username(s, user_id)
 
         @staticmethod
         async def get_first_name(user_id: int) -> Optional[str]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_first_name(s, user_id)
 
         @staticmethod
         async def get_last_name(user_id: int) -> Optional[str]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_last_name(s, user_id)
 
         @staticmethod
         async def get_full_name(user_id: int) -> Optional[str]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_full_name(s, user_id)
 
         @staticmethod
         async def get_language(user_id: int) -> Optional[str]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_language(s, user_id)
 
         @staticmethod
         async def is_admin(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.is_admin(s, user_id)
 
         @staticmethod
         async def is_hr(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.is_hr(s, user_id)
 
         @staticmethod
         async def is_active(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.is_active(s, user_id)
 
         @staticmethod
         async def is_blocked(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.is_blocked(s, user_id)
 
         # ===== STATE =====
         @staticmethod
         async def get_state(user_id: int) -> Optional[str]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_state(s, user_id)
 
         @staticmethod
         async def get_state_data(user_id: int) -> Optional[dict]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_state_data(s, user_id)
 
         @staticmethod
         async def get_state_with_data(user_id: int) -> tuple[Optional[str], Optional[dict]]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_state_with_data(s, user_id)
 
         @staticmethod
         async def set_state(user_id: int, state: str, state_data: dict = None) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.set_state(s, user_id, state, state_data)
 
         @staticmethod
         async def update_state_data(user_id: int, **kwargs) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.update_state_data(s, user_id, **kwargs)
 
         @staticmethod
         async def clear_state(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.clear_state(s, user_id)
 
         # ===== UPDATE =====
         @staticmethod
         async def update(user_id: int, **kwargs) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.update(s, user_id, **kwargs)
 
         @staticmethod
         async def set_first_name(user_id: int, first_name: str) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.set_first_name(s, user_id, first_name)
 
         @staticmethod
         async def set_last_name(user_id: int, last_name: str) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.set_last_name(s, user_id, last_name)
 
         @staticmethod
         async def set_username(user_id: int, username: str) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.set_username(s, user_id, username)
 
         @staticmethod
         async def set_language(user_id: int, language: str) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.set_language(s, user_id, language)
 
 
         @staticmethod
         async def set_blocked(user_id: int, blocked: bool) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.set_blocked(s, user_id, blocked)
 
         @staticmethod
         async def sync_telegram(user_id: int, first_name: str, last_name: str = None, username: str = None) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.sync_telegram_data(s, user_id, first_name, last_name, username)
             
 
         # ===== DELETE =====
         @staticmethod
         async def delete(user_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.delete(s, user_id)
 
         # ===== LISTS =====
         @staticmethod
         async def get_admins():
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_admins(s)
 
         @staticmethod
         async def get_all_ids(active_only: bool = True) -> list[int]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.get_all_ids(s, active_only)
 
         @staticmethod
         async def count(active_only: bool = True) -> int:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await UserRepo.count(s, active_only)
 
     class app:
@@ -187,170 +210,270 @@ class DB:
         # ===== CREATE =====
         @staticmethod
         async def create(user_id: int):
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.create(s, user_id)
 
         @staticmethod
         async def get_or_create_draft(user_id: int):
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.get_or_create_draft(s, user_id)
 
         # ===== READ =====
+        @staticmethod
+        async def _flush_user(user_id: int) -> None:
+            """Write staged answers of this user's applications only - never other users'"""
+            if not app_buffer.has_pending():
+                return
+            async with session_scope() as s:
+                app_ids = await ApplicationRepo.get_ids_by_user(s, user_id)
+            await app_buffer.flush_many(app_ids)
+
         @staticmethod
         async def get(app_id: int):
-            async with async_session() as s:
+            await app_buffer.flush(app_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.get(s, app_id)
 
         @staticmethod
         async def get_by_user(user_id: int, status: ApplicationStatusEnum = None):
-            async with async_session() as s:
+            await DB.app._flush_user(user_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.get_by_user(s, user_id, status)
 
         @staticmethod
         async def get_draft(user_id: int):
-            async with async_session() as s:
+            await DB.app._flush_user(user_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.get_draft(s, user_id)
 
         @staticmethod
         async def get_latest(user_id: int):
-            async with async_session() as s:
+            await DB.app._flush_user(user_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.get_latest(s, user_id)
 
         @staticmethod
         async def get_pending(limit: int = 100):
-            async with async_session() as s:
+            # submit() flushed each of them already
+            async with session_scope() as s:
                 return await ApplicationRepo.get_pending(s, limit)
 
+        @staticmethod
+        async def get_missing_media(after_id: int = 0, limit: int = 50):
+            async with session_scope() as s:
+                return await ApplicationRepo.get_missing_media(s, after_id, limit)
+
         @staticmethod
         async def get_status(app_id: int) -> Optional[ApplicationStatusEnum]:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.get_status(s, app_id)
 
         @staticmethod
         async def get_full_name(app_id: int) -> Optional[str]:
-            async with async_session() as s:
+            await app_buffer.flush(app_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.get_full_name(s, app_id)
 
         @staticmethod
         async def get_phone(app_id: int) -> Optional[str]:
-            async with async_session() as s:
+            await app_buffer.flush(app_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.get_phone(s, app_id)
 
         # ===== UPDATE =====
         @staticmethod
         async def update(app_id: int, **kwargs) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, **kwargs)
+            async with session_scope() as s:
                 return await ApplicationRepo.update(s, app_id, **kwargs)
 
         @staticmethod
         async def set_first_name(app_id: int, name: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, first_name=name)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_first_name(s, app_id, name)
 
         @staticmethod
         async def set_last_name(app_id: int, name: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, last_name=name)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_last_name(s, app_id, name)
 
         @staticmethod
         async def set_birth_date(app_id: int, birth_date: date) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, birth_date=birth_date)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_birth_date(s, app_id, birth_date)
 
         @staticmethod
         async def set_gender(app_id: int, gender: GenderEnum) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, gender=gender)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_gender(s, app_id, gender)
 
         @staticmethod
         async def set_address(app_id: int, address: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, address=address)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_address(s, app_id, address)
 
         @staticmethod
         async def set_phone(app_id: int, phone: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, phone_number=phone)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_phone(s, app_id, phone)
 
         @staticmethod
         async def set_photo(app_id: int, path: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, photo_path=path)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_photo(s, app_id, path)
             
         @staticmethod
-        async def set_is_student(user_id: int, is_student: bool) -> bool:
+        async def replace_photo(app_id: int, original: str, path: str, thumb_path: Optional[str] = None) -> bool:
+            """Background photo processing - always its own session and commit, never the handler's"""
+            await app_buffer.flush(app_id)
             async with async_session() as s:
-                return await ApplicationRepo.set_is_student(s, user_id, is_student)
+                return await ApplicationRepo.replace_photo(s, app_id, original, path, thumb_path)
+
+        @staticmethod
+        async def set_is_student(app_id: int, is_student: bool) -> bool:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, is_student=is_student)
+            async with session_scope() as s:
+                return await ApplicationRepo.set_is_student(s, app_id, is_student)
 
         @staticmethod
         async def set_resume(app_id: int, path: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, resume_path=path)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_resume(s, app_id, path)
 
+        @staticmethod
+        async def set_photo_file(app_id: int, file_id: str, file_unique_id: str) -> bool:
+            if app_buffer.enabled:
+                return app_buffer.stage(
+                    app_id, photo_file_id=file_id, photo_file_unique_id=file_unique_id,
+                    photo_path=None, photo_thumb_path=None
+                )
+            async with session_scope() as s:
+                return await ApplicationRepo.set_photo_file(s, app_id, file_id, file_unique_id)
+
+        @staticmethod
+        async def set_resume_file(app_id: int, file_id: str, file_unique_id: str) -> bool:
+            if app_buffer.enabled:
+                return app_buffer.stage(
+                    app_id, resume_file_id=file_id, resume_file_unique_id=file_unique_id, resume_path=None
+                )
+            async with session_scope() as s:
+                return await ApplicationRepo.set_resume_file(s, app_id, file_id, file_unique_id)
+
+        @staticmethod
+        async def attach_photo(app_id: int, file_id: str, path: str) -> bool:
+            await app_buffer.flush(app_id)
+            async with session_scope() as s:
+                return await ApplicationRepo.attach_photo(s, app_id, file_id, path)
+
+        @staticmethod
+        async def attach_resume(app_id: int, file_id: str, path: str) -> bool:
+            await app_buffer.flush(app_id)
+            async with session_scope() as s:
+                return await ApplicationRepo.attach_resume(s, app_id, file_id, path)
+
         @staticmethod
         async def set_russian_level(app_id: int, level: LevelEnum) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, russian_level=level)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_russian_level(s, app_id, level)
 
         @staticmethod
         async def set_english_level(app_id: int, level: LevelEnum) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, english_level=level)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_english_level(s, app_id, level)
 
         @staticmethod
         async def set_russian_voice(app_id: int, path: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, russian_voice_path=path)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_russian_voice(s, app_id, path)
 
         @staticmethod
         async def set_english_voice(app_id: int, path: str) -> bool:
-            async with async_session() as s:
+            if app_buffer.enabled:
+                return app_buffer.stage(app_id, english_voice_path=path)
+            async with session_scope() as s:
                 return await ApplicationRepo.set_english_voice(s, app_id, path)
 
+        @staticmethod
+        async def flush(app_id: int = None) -> int:
+            """Write buffered answers now (checkpoint)"""
+            return await app_buffer.flush(app_id)
+
         # ===== STATUS =====
         @staticmethod
-        async def submit(app_id: int) -> bool:
-            async with async_session() as s:
-                return await ApplicationRepo.submit(s, app_id)
+        async def submit(app_id: int, notify: Optional[dict[str, Any]] = None) -> bool:
+            await app_buffer.flush(app_id)
+            async with session_scope() as s:
+                return await ApplicationRepo.submit(s, app_id, notify)
 
         @staticmethod
         async def accept(app_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.accept(s, app_id)
 
         @staticmethod
         async def reject(app_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.reject(s, app_id)
 
         @staticmethod
         async def withdraw(app_id: int) -> bool:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.withdraw(s, app_id)
 
         # ===== DELETE =====
         @staticmethod
         async def delete(app_id: int) -> bool:
-            async with async_session() as s:
+            app_buffer.discard(app_id)
+            async with session_scope() as s:
                 return await ApplicationRepo.delete(s, app_id)
 
         @staticmethod
         async def delete_drafts(user_id: int) -> int:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.delete_drafts(s, user_id)
 
         # ===== STATS =====
         @staticmethod
         async def count(status: ApplicationStatusEnum = None) -> int:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.count(s, status)
 
         @staticmethod
         async def count_pending() -> int:
-            async with async_session() as s:
+            async with session_scope() as s:
                 return await ApplicationRepo.count_pending(s)
 
         @staticmethod
         async def get_stats() -> dict[str, int]:
-            async with async_session() as s:
-                return await ApplicationRepo.get_stats(s)
\ No newline at end of file
+            async with session_scope() as s:
+                return await ApplicationRepo.get_stats(s)
+
+        @staticmethod
+        async def media_refs() -> Counter:
+            await app_buffer.flush()
+            async with session_scope() as s:
+                return await ApplicationRepo.media_refs(s)
\ No newline at end of file
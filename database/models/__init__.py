@@ -3,4 +3,5 @@ database.models
 """
 from .base import Base
 from .user import User
-from .application import Application
\ No newline at end of file
+from .application import Application
+from .outbox import OutboxEvent
\ No newline at end of file
@@ -63,8 +63,15 @@ class Application(Base):
 
     #Documents
     photo_path = Column(String, nullable=True)
+    photo_thumb_path = Column(String, nullable=True)
     resume_path = Column(String, nullable=True)
 
+    #Telegram copies - files are downloaded from these on demand (LAZY_MEDIA)
+    photo_file_id = Column(String, nullable=True)
+    photo_file_unique_id = Column(String, nullable=True)
+    resume_file_id = Column(String, nullable=True)
+    resume_file_unique_id = Column(String, nullable=True)
+
     #Additional info
     how_found_us = Column(String, nullable=True)
     additional_notes = Column(String, nullable=True)
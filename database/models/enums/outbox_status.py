@@ -0,0 +1,7 @@
+import enum
+
+
+class OutboxStatusEnum(enum.Enum):
+    pending = "pending"
+    sent = "sent"
+    failed = "failed"
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index
+from .base import Base
+from .enums.outbox_status import OutboxStatusEnum
+
+
+class OutboxEvent(Base):
+    """Side effect (e.g. admin notification) committed together with the change that caused it"""
+    __tablename__ = "outbox"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(64), nullable=False)
+    payload = Column(Text, nullable=False)  # json
+
+    status = Column(Enum(OutboxStatusEnum), nullable=False, default=OutboxStatusEnum.pending)
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # next attempt / lease end
+    last_error = Column(Text, nullable=True)
+    sent_at = Column(DateTime, nullable=True)
+
+    # Indexes
+    __table_args__ = (
+        Index("ix_outbox_status_available", "status", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, kind={self.kind}, status={self.status})>"
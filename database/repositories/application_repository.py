@@ -1,10 +1,16 @@
-from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy import select, update, delete, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, Any
 from datetime import date
+from collections import Counter
+import os
 
 from database.models.application import Application
 from database.models.enums.application_status import ApplicationStatusEnum, GenderEnum, LevelEnum
+from database.repositories.outbox_repository import OutboxRepo
+
+# Outbox event kinds
+APPLICATION_SUBMITTED = "application_submitted"
 
 
 class ApplicationRepo:
@@ -60,6 +66,14 @@ class ApplicationRepo:
         result = await session.execute(query)
         return list(result.scalars().all())
 
+    @staticmethod
+    async def get_ids_by_user(session: AsyncSession, user_id: int) -> list[int]:
+        """IDs of all applications of a user"""
+        result = await session.execute(
+            select(Application.id).where(Application.user_id == user_id)
+        )
+        return list(result.scalars())
+
     @staticmethod
     async def get_draft(session: AsyncSession, user_id: int) -> Optional[Application]:
         """Get user's draft application"""
@@ -117,6 +131,24 @@ class ApplicationRepo:
         """Get pending applications"""
         return await ApplicationRepo.get_by_status(session, ApplicationStatusEnum.pending, limit)
 
+    @staticmethod
+    async def get_missing_media(session: AsyncSession, after_id: int = 0, limit: int = 50) -> list[Application]:
+        """Submitted applications whose Telegram files are not downloaded yet (id > after_id)"""
+        result = await session.execute(
+            select(Application)
+            .where(
+                Application.id > after_id,
+                Application.status != ApplicationStatusEnum.draft,
+                or_(
+                    and_(Application.photo_file_id.is_not(None), Application.photo_path.is_(None)),
+                    and_(Application.resume_file_id.is_not(None), Application.resume_path.is_(None))
+                )
+            )
+            .order_by(Application.id)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
     # ==================== FIELD GETTERS ====================
 
     @staticmethod
@@ -200,6 +232,20 @@ class ApplicationRepo:
         await session.commit()
         return result.rowcount > 0
 
+    @staticmethod
+    async def update_many(session: AsyncSession, changes: dict[int, dict[str, Any]]) -> int:
+        """Apply {app_id: {field: value}} - one UPDATE per application, single commit"""
+        updated = 0
+        for app_id, fields in changes.items():
+            if not fields:
+                continue
+            result = await session.execute(
+                update(Application).where(Application.id == app_id).values(**fields)
+            )
+            updated += result.rowcount
+        await session.commit()
+        return updated
+
     @staticmethod
     async def set_first_name(session: AsyncSession, app_id: int, first_name: str) -> bool:
         result = await session.execute(
@@ -320,6 +366,72 @@ class ApplicationRepo:
         await session.commit()
         return result.rowcount > 0
 
+    @staticmethod
+    async def replace_photo(
+        session: AsyncSession,
+        app_id: int,
+        original: str,
+        path: str,
+        thumb_path: Optional[str]
+    ) -> bool:
+        """Swap in a processed photo - only if the applicant has not sent another one meanwhile"""
+        result = await session.execute(
+            update(Application)
+            .where(Application.id == app_id, Application.photo_path == original)
+            .values(photo_path=path, photo_thumb_path=thumb_path)
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def set_photo_file(session: AsyncSession, app_id: int, file_id: str, file_unique_id: str) -> bool:
+        """Remember the Telegram photo - downloaded later, the old file is dropped"""
+        result = await session.execute(
+            update(Application).where(Application.id == app_id).values(
+                photo_file_id=file_id,
+                photo_file_unique_id=file_unique_id,
+                photo_path=None,
+                photo_thumb_path=None
+            )
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def set_resume_file(session: AsyncSession, app_id: int, file_id: str, file_unique_id: str) -> bool:
+        """Remember the Telegram resume - downloaded later, the old file is dropped"""
+        result = await session.execute(
+            update(Application).where(Application.id == app_id).values(
+                resume_file_id=file_id,
+                resume_file_unique_id=file_unique_id,
+                resume_path=None
+            )
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def attach_photo(session: AsyncSession, app_id: int, file_id: str, path: str) -> bool:
+        """Store the downloaded photo - only if it is still the applicant's current one"""
+        result = await session.execute(
+            update(Application)
+            .where(Application.id == app_id, Application.photo_file_id == file_id)
+            .values(photo_path=path)
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    @staticmethod
+    async def attach_resume(session: AsyncSession, app_id: int, file_id: str, path: str) -> bool:
+        """Store the downloaded resume - only if it is still the applicant's current one"""
+        result = await session.execute(
+            update(Application)
+            .where(Application.id == app_id, Application.resume_file_id == file_id)
+            .values(resume_path=path)
+        )
+        await session.commit()
+        return result.rowcount > 0
+
     @staticmethod
     async def set_resume(session: AsyncSession, app_id: int, path: str) -> bool:
         result = await session.execute(
@@ -355,8 +467,13 @@ class ApplicationRepo:
         return result.rowcount > 0
 
     @staticmethod
-    async def submit(session: AsyncSession, app_id: int) -> bool:
-        """Submit application (draft -> pending)"""
+    async def submit(session: AsyncSession, app_id: int, notify: Optional[dict[str, Any]] = None) -> bool:
+        """
+        Submit application (draft -> pending)
+
+        notify: payload of an "application_submitted" outbox event, committed
+        in the same transaction as the status change
+        """
         result = await session.execute(
             update(Application)
             .where(
@@ -365,8 +482,11 @@ class ApplicationRepo:
             )
             .values(status=ApplicationStatusEnum.pending)
         )
+        submitted = result.rowcount > 0
+        if submitted and notify is not None:
+            OutboxRepo.add(session, APPLICATION_SUBMITTED, {"app_id": app_id, **notify})
         await session.commit()
-        return result.rowcount > 0
+        return submitted
 
     @staticmethod
     async def start_review(session: AsyncSession, app_id: int) -> bool:
@@ -476,6 +596,27 @@ class ApplicationRepo:
         """Count pending applications"""
         return await ApplicationRepo.count(session, ApplicationStatusEnum.pending)
 
+    @staticmethod
+    async def media_refs(session: AsyncSession) -> Counter:
+        """Number of applications referencing each stored file path"""
+        columns = (
+            Application.photo_path,
+            Application.photo_thumb_path,
+            Application.resume_path,
+            Application.russian_voice_path,
+            Application.english_voice_path,
+        )
+        refs = Counter()
+        for column in columns:
+            result = await session.execute(
+                select(column, func.count(Application.id))
+                .where(column.is_not(None))
+                .group_by(column)
+            )
+            for path, count in result.all():
+                refs[os.path.normpath(path)] += count
+        return refs
+
     @staticmethod
     async def get_stats(session: AsyncSession) -> dict[str, int]:
         """Get application statistics by status"""
@@ -0,0 +1,116 @@
+from sqlalchemy import select, update, func, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Any
+from datetime import datetime
+import json
+
+from database.models.outbox import OutboxEvent
+from database.models.enums.outbox_status import OutboxStatusEnum
+
+
+class OutboxRepo:
+    """
+    Transactional outbox - events are added inside the caller's transaction
+    and claimed / settled by the outbox worker
+    """
+
+    __slots__ = ()
+
+    @staticmethod
+    def add(session: AsyncSession, kind: str, payload: dict[str, Any]) -> OutboxEvent:
+        """Stage an event - no commit, it is written with the caller's change"""
+        event = OutboxEvent(
+            kind=kind,
+            payload=json.dumps(payload, ensure_ascii=False),
+            status=OutboxStatusEnum.pending,
+            attempts=0,
+            available_at=datetime.utcnow(),
+        )
+        session.add(event)
+        return event
+
+    @staticmethod
+    async def claim(
+        session: AsyncSession,
+        now: datetime,
+        lease_until: datetime,
+        limit: int = 20
+    ) -> list[tuple[int, str, dict[str, Any], int]]:
+        """
+        Take due events - (id, kind, payload, attempts) each
+
+        A claimed event is hidden until lease_until, so other workers skip it
+        and a crashed worker's events come back once the lease runs out.
+        """
+        due = (
+            select(OutboxEvent.id)
+            .where(OutboxEvent.status == OutboxStatusEnum.pending, OutboxEvent.available_at <= now)
+            .order_by(OutboxEvent.id)
+            .limit(limit)
+        )
+        result = await session.execute(
+            update(OutboxEvent)
+            .where(
+                OutboxEvent.id.in_(due.scalar_subquery()),
+                OutboxEvent.status == OutboxStatusEnum.pending,
+                OutboxEvent.available_at <= now
+            )
+            .values(available_at=lease_until, attempts=OutboxEvent.attempts + 1)
+            .returning(OutboxEvent.id, OutboxEvent.kind, OutboxEvent.payload, OutboxEvent.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await session.commit()
+        return sorted((row.id, row.kind, json.loads(row.payload), row.attempts) for row in rows)
+
+    @staticmethod
+    async def mark_sent(session: AsyncSession, event_ids: list[int]) -> None:
+        if not event_ids:
+            return
+        now = datetime.utcnow()
+        await session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(status=OutboxStatusEnum.sent, sent_at=now, last_error=None)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+    @staticmethod
+    async def reschedule(session: AsyncSession, failures: list[dict[str, Any]]) -> None:
+        """
+        Settle failed events in one executemany
+
+        failures: [{"id", "payload", "error", "available_at", "failed"}, ...]
+        """
+        if not failures:
+            return
+        table = OutboxEvent.__table__
+        await session.execute(
+            update(table)
+            .where(table.c.id == bindparam("event_id"))
+            .values(
+                payload=bindparam("new_payload"),
+                last_error=bindparam("error"),
+                available_at=bindparam("next_at"),
+                status=bindparam("new_status"),
+            ),
+            [
+                {
+                    "event_id": f["id"],
+                    "new_payload": json.dumps(f["payload"], ensure_ascii=False),
+                    "error": f["error"],
+                    "next_at": f["available_at"],
+                    "new_status": OutboxStatusEnum.failed if f["failed"] else OutboxStatusEnum.pending,
+                }
+                for f in failures
+            ]
+        )
+        await session.commit()
+
+    @staticmethod
+    async def count_pending(session: AsyncSession) -> int:
+        result = await session.execute(
+            select(func.count()).select_from(OutboxEvent).where(OutboxEvent.status == OutboxStatusEnum.pending)
+        )
+        return result.scalar_one()
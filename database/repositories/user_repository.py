@@ -1,9 +1,13 @@
-from sqlalchemy import select, update, delete, exists, func
+from sqlalchemy import select, update, delete, exists, func, bindparam, literal_column
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy.dialects import postgresql, sqlite
 from typing import Optional, Any
+from datetime import datetime
 import json
 
 from database.models.user import User
+from database.user_cache import user_cache, UserProfile
 
 
 class UserRepo:
@@ -47,8 +51,11 @@ class UserRepo:
             language_code: Optional[str] = None
 
     ) -> tuple[User, bool]:
-        """Get existing user or create new one. Returns (user, created)"""
-        user = await session.get(User, user_id)
+        """Get existing user or create new one. Returns (user, created)
+
+        Does not load User.applications (hot path - called for every update)
+        """
+        user = await session.get(User, user_id, options=[raiseload(User.applications)])
         if user:
             return user, False
 
@@ -65,6 +72,53 @@ class UserRepo:
     
         
 
+    @staticmethod
+    async def upsert(
+            session: AsyncSession,
+            user_id: int,
+            first_name: str,
+            last_name: Optional[str] = None,
+            username: Optional[str] = None
+    ) -> tuple[UserProfile, bool]:
+        """Register or sync Telegram names in one round-trip. Returns (profile, created)
+
+        INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING - race free, so
+        concurrent first messages of one user never hit IntegrityError.
+        Whether the row was inserted is decided by the database itself:
+        xmax = 0 on PostgreSQL; elsewhere an update moves updated_at past
+        the stored created_at, while a fresh row has both equal.
+        """
+        now = datetime.utcnow()
+        if session.get_bind().dialect.name == "postgresql":
+            insert, inserted = postgresql.insert, literal_column("xmax = 0")
+        else:
+            insert, inserted = sqlite.insert, User.created_at == User.updated_at
+        stmt = insert(User).values(
+            id=user_id,
+            first_name=first_name,
+            last_name=last_name,
+            username=username,
+            created_at=now,
+            updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "first_name": stmt.excluded.first_name,
+                "last_name": stmt.excluded.last_name,
+                "username": stmt.excluded.username,
+                "updated_at": stmt.excluded.updated_at,
+            }
+        ).returning(
+            User.id, User.first_name, User.last_name, User.username, User.language_code,
+            User.is_blocked, User.is_active, User.is_admin, inserted.label("inserted")
+        )
+        row = (await session.execute(stmt)).one()
+        created = bool(row.inserted)
+        await session.commit()
+        user_cache.invalidate_committed(user_id)
+        return UserProfile(*row[:8]), created
+
     # ==================== READ ====================
 
     @staticmethod
@@ -206,16 +260,54 @@ class UserRepo:
             state: str,
             state_data: Optional[dict] = None
     ) -> bool:
-        """Set user state and optional data - FAST"""
-        data_str = json.dumps(state_data, ensure_ascii=False) if state_data else None
+        """Set user state and optional data (state_data is kept when not given) - FAST"""
+        values = {"state": state}
+        if state_data is not None:
+            values["state_data"] = json.dumps(state_data, ensure_ascii=False)
         result = await session.execute(
             update(User)
             .where(User.id == user_id)
-            .values(state=state, state_data=data_str)
+            .values(**values)
         )
         await session.commit()
         return result.rowcount > 0
 
+    @staticmethod
+    async def set_states(
+            session: AsyncSession,
+            states: dict[int, tuple[Optional[str], Optional[dict]]]
+    ) -> None:
+        """Write {user_id: (state, state_data)} in one executemany and one commit"""
+        if not states:
+            return
+        await session.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == bindparam("uid"))
+            .values(state=bindparam("st"), state_data=bindparam("sd")),
+            [
+                {
+                    "uid": user_id,
+                    "st": state,
+                    "sd": json.dumps(data, ensure_ascii=False) if data else None,
+                }
+                for user_id, (state, data) in states.items()
+            ]
+        )
+        await session.commit()
+
+    @staticmethod
+    async def set_state_many(session: AsyncSession, states: dict[int, Optional[str]]) -> None:
+        """Write {user_id: state} in one executemany and one commit, state_data untouched"""
+        if not states:
+            return
+        await session.execute(
+            update(User.__table__)
+            .where(User.__table__.c.id == bindparam("uid"))
+            .values(state=bindparam("st")),
+            [{"uid": user_id, "st": state} for user_id, state in states.items()]
+        )
+        await session.commit()
+
     @staticmethod
     async def update_state_data(
             session: AsyncSession,
@@ -261,6 +353,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(**kwargs)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -270,6 +363,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(first_name=first_name)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -279,6 +373,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(last_name=last_name)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -288,6 +383,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(username=username)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -297,6 +393,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(language_code=language_code)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -307,6 +404,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(is_active=is_active)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -316,6 +414,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(is_blocked=is_blocked)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -340,6 +439,7 @@ class UserRepo:
         result = await session.execute(
             update(User).where(User.id == user_id).values(**values)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -351,6 +451,7 @@ class UserRepo:
         result = await session.execute(
             delete(User).where(User.id == user_id)
         )
+        user_cache.invalidate_committed(user_id)
         await session.commit()
         return result.rowcount > 0
 
@@ -0,0 +1,157 @@
+"""
+Per-update unit of work - one session, one transaction, one commit
+"""
+import asyncio
+import contextvars
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from database.config import engine, async_session
+
+
+class UnitOfWorkSession(AsyncSession):
+    """
+    Session shared by every DB call of a single update
+
+    Repositories commit after each statement; inside a unit of work that
+    only flushes, and the owner commits once when the update is handled.
+    """
+
+    async def commit(self) -> None:
+        await self.flush()
+
+    async def commit_unit(self) -> None:
+        """Real commit - called once by UnitOfWork"""
+        await super().commit()
+
+
+uow_session = async_sessionmaker(
+    engine,
+    class_=UnitOfWorkSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
+_current: ContextVar[Optional["UnitOfWork"]] = ContextVar("unit_of_work", default=None)
+
+
+class UnitOfWork:
+    """
+    Opens one session for the current task and makes DB facade reuse it
+
+    Usage:
+        async with UnitOfWork() as session:
+            await DB.app.set_first_name(app_id, "John")
+            await DB.user.set_state(user_id, "...")
+        # single COMMIT here
+    """
+
+    __slots__ = ("session", "active", "_token", "_task", "_after_commit", "_on_rollback")
+
+    def __init__(self):
+        self.session: Optional[UnitOfWorkSession] = None
+        self.active = False
+        self._token = None
+        self._task: Optional[asyncio.Task] = None
+        self._after_commit: list[Callable[[], None]] = []
+        self._on_rollback: list[Callable[[], None]] = []
+
+    async def __aenter__(self) -> UnitOfWorkSession:
+        self.session = uow_session()
+        self.active = True
+        self._token = _current.set(self)
+        self._task = asyncio.current_task()
+        return self.session
+
+    async def checkpoint(self) -> None:
+        """
+        Commit what the update wrote so far and keep going in a new transaction
+
+        Called before slow outbound I/O so locks (SQLite's single write lock)
+        are not held across it. Work up to here becomes final: after_commit
+        callbacks run now, rollback callbacks are dropped.
+        """
+        if not self.session.in_transaction():
+            return
+        await self.session.commit_unit()
+        callbacks, self._after_commit = self._after_commit, []
+        self._on_rollback.clear()
+        # Outside this unit of work - tasks the callbacks spawn must open their own sessions
+        context = contextvars.copy_context()
+        context.run(_current.set, None)
+        for callback in callbacks:
+            context.run(callback)
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        # Tasks spawned by the handler copy the context - mark inactive
+        # first so they never write into a finished transaction
+        self.active = False
+        _current.reset(self._token)
+        committed = False
+        try:
+            if exc_type is None:
+                await self.session.commit_unit()
+                committed = True
+            else:
+                await self.session.rollback()
+        finally:
+            await self.session.close()
+            # A failed commit counts as a rollback too
+            for callback in self._after_commit if committed else self._on_rollback:
+                callback()
+
+
+def _owned() -> Optional[UnitOfWork]:
+    """
+    Unit of work of the current task, if any
+
+    Tasks spawned by a handler copy its context, but must never use its
+    session - only the task that opened the unit of work sees it.
+    """
+    uow = _current.get()
+    if uow is not None and uow.active and uow._task is asyncio.current_task():
+        return uow
+    return None
+
+
+def current_session() -> Optional[UnitOfWorkSession]:
+    """Session of the running unit of work, if any"""
+    uow = _owned()
+    return uow.session if uow is not None else None
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """Run callback once the current unit of work commits (now if there is none)"""
+    uow = _owned()
+    if uow is not None:
+        uow._after_commit.append(callback)
+    else:
+        callback()
+
+
+async def checkpoint() -> None:
+    """Checkpoint the unit of work of the current task, if there is one"""
+    uow = _owned()
+    if uow is not None:
+        await uow.checkpoint()
+
+
+def on_rollback(callback: Callable[[], None]) -> None:
+    """Run callback if the current unit of work rolls back (never if there is none)"""
+    uow = _owned()
+    if uow is not None:
+        uow._on_rollback.append(callback)
+
+
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    """Reuse the unit-of-work session, or open a short-lived one"""
+    session = current_session()
+    if session is not None:
+        yield session
+        return
+    async with async_session() as s:
+        yield s
@@ -0,0 +1,116 @@
+"""
+In-process cache of slim user profiles (hot path of AuthMiddleware)
+"""
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from database.models.user import User
+from database.unit_of_work import after_commit, on_rollback
+
+
+class UserProfile:
+    """Read-only subset of User that handlers need"""
+
+    __slots__ = (
+        "id", "first_name", "last_name", "username", "language_code",
+        "is_blocked", "is_active", "is_admin",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        first_name: str,
+        last_name: Optional[str] = None,
+        username: Optional[str] = None,
+        language_code: Optional[str] = None,
+        is_blocked: bool = False,
+        is_active: bool = True,
+        is_admin: bool = False
+    ):
+        self.id = id
+        self.first_name = first_name
+        self.last_name = last_name
+        self.username = username
+        self.language_code = language_code
+        self.is_blocked = bool(is_blocked)
+        self.is_active = True if is_active is None else bool(is_active)
+        self.is_admin = bool(is_admin)
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserProfile":
+        return cls(
+            id=user.id,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            username=user.username,
+            language_code=user.language_code,
+            is_blocked=user.is_blocked,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+        )
+
+    def __repr__(self):
+        return f"<UserProfile(id={self.id}, username={self.username})>"
+
+
+class UserProfileCache:
+    """
+    LRU + TTL cache of UserProfile by user id
+
+    UserRepo setters invalidate entries, so a cached profile is never older
+    than the last write made by this process (other workers: at most ttl).
+    Inside a unit of work only committed state is cached - see put_committed
+    and invalidate_committed.
+    """
+
+    __slots__ = ("ttl", "max_size", "_items")
+
+    def __init__(self, ttl: float = 300.0, max_size: int = 100_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._items: OrderedDict[int, tuple[float, UserProfile]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, user_id: int) -> Optional[UserProfile]:
+        item = self._items.get(user_id)
+        if item is None:
+            return None
+        expires, profile = item
+        if expires < time.monotonic():
+            del self._items[user_id]
+            return None
+        self._items.move_to_end(user_id)
+        return profile
+
+    def put(self, profile: UserProfile) -> None:
+        self._items[profile.id] = (time.monotonic() + self.ttl, profile)
+        self._items.move_to_end(profile.id)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        self._items.pop(user_id, None)
+
+    def put_committed(self, profile: UserProfile) -> None:
+        """Cache a profile once the current unit of work commits - never a row that may roll back"""
+        after_commit(lambda: self.put(profile))
+
+    def invalidate_committed(self, user_id: int) -> None:
+        """
+        Drop an entry after a write - now and again when the write is final
+
+        A reader may re-cache the old committed row before our commit lands,
+        so the entry is dropped once more after commit (or rollback).
+        """
+        self.invalidate(user_id)
+        after_commit(lambda: self.invalidate(user_id))
+        on_rollback(lambda: self.invalidate(user_id))
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+user_cache = UserProfileCache()
@@ -0,0 +1,132 @@
+"""
+Write-behind buffer for application answers
+
+Questionnaire answers are staged in memory per application and written as a
+single multi-column UPDATE at checkpoints (photo / confirmation steps), on a
+timer, before submit and on shutdown - instead of one UPDATE + COMMIT per answer.
+"""
+import asyncio
+import logging
+from typing import Any, Iterable, Optional
+
+from core.config import config
+from database.repositories.application_repository import ApplicationRepo
+from database.unit_of_work import on_rollback, session_scope
+
+logger = logging.getLogger(__name__)
+
+
+class ApplicationWriteBuffer:
+    """
+    Coalesces application field updates
+
+    Usage:
+        app_buffer.stage(app_id, first_name="John")
+        app_buffer.stage(app_id, last_name="Doe")
+        await app_buffer.flush(app_id)   # UPDATE application SET first_name=.., last_name=..
+    """
+
+    __slots__ = ("enabled", "interval", "_pending", "_inflight", "_task")
+
+    def __init__(self, enabled: bool = False, interval: float = 5.0):
+        self.enabled = enabled
+        self.interval = interval
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._inflight: dict[int, asyncio.Event] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def stage(self, app_id: int, **fields) -> bool:
+        """Remember field values - later values win"""
+        if not fields:
+            return False
+        self._pending.setdefault(app_id, {}).update(fields)
+        return True
+
+    def pending(self, app_id: int) -> dict[str, Any]:
+        """Staged but not yet written values"""
+        return dict(self._pending.get(app_id, {}))
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def discard(self, app_id: int) -> None:
+        """Drop staged values (application deleted)"""
+        self._pending.pop(app_id, None)
+
+    async def flush(self, app_id: Optional[int] = None) -> int:
+        """Write staged values of one application (or all of them)"""
+        if app_id is not None:
+            return await self.flush_many((app_id,))
+        if not self._pending:
+            return 0
+        batch, self._pending = self._pending, {}
+        return await self._write(batch)
+
+    async def flush_many(self, app_ids: Iterable[int]) -> int:
+        """Write staged values of the given applications only"""
+        batch = {}
+        for app_id in app_ids:
+            # Read-your-writes: wait for a timer flush already writing this app
+            inflight = self._inflight.get(app_id)
+            if inflight is not None:
+                await inflight.wait()
+            if app_id in self._pending:
+                batch[app_id] = self._pending.pop(app_id)
+        if not batch:
+            return 0
+        return await self._write(batch)
+
+    async def _write(self, batch: dict[int, dict[str, Any]]) -> int:
+        done = asyncio.Event()
+        for key in batch:
+            self._inflight[key] = done
+        try:
+            async with session_scope() as s:
+                written = await ApplicationRepo.update_many(s, batch)
+            # Inside a unit of work the UPDATE commits with the update's
+            # transaction - if that rolls back, the values are staged again
+            on_rollback(lambda: self._restage(batch))
+            return written
+        except Exception:
+            self._restage(batch)
+            raise
+        finally:
+            for key in batch:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            done.set()
+
+    def _restage(self, batch: dict[int, dict[str, Any]]) -> None:
+        """Put values back without overriding anything staged meanwhile"""
+        for key, fields in batch.items():
+            self._pending[key] = {**fields, **self._pending.get(key, {})}
+
+    def start(self) -> None:
+        """Start periodic flushing"""
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the timer and write everything that is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flush failed: {e}")
+
+
+app_buffer = ApplicationWriteBuffer(
+    enabled=config.write_behind,
+    interval=config.write_behind_interval,
+)
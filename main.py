@@ -1,22 +1,47 @@
 import asyncio
 import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 
 import uvicorn
 from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.redis import RedisStorage
 from fastapi import FastAPI, status
 from fastapi.requests import Request
 from fastapi.responses import Response
 from dotenv import load_dotenv
+from redis.asyncio import Redis
 
 from core.config import config
 from core.logging import setup_logging
+from core.redis import get_redis, close_redis
 from database.database import init_db
+from database.write_behind import app_buffer
 from bot.handlers import register_handlers
 from bot.middlewares.auth import AuthMiddleware
+from bot.middlewares.database import DatabaseMiddleware, CommitBeforeRequest
+from bot.middlewares.deduplication import DeduplicationMiddleware
 from bot.middlewares.throttling import ThrottlingMiddleware
 from bot.middlewares.anti_spam import AntiSpamMiddleware
 from bot.middlewares.private_chat_only import PrivateChatOnlyMiddleware
+from bot.middlewares.pipeline import MiddlewarePipeline, Stage, MEMORY, NETWORK, DATABASE
+from bot.storage.database import DatabaseStorage
+from bot.storage.projection import ProjectedStorage
+from services.rate_limiter import RedisGCRALimiter
+from services.update_queue import UpdateQueue
+from services.update_dedup import UpdateDeduplicator
+from services.notifier import notifier
+from bot.keyboards.reply import Keyboards
+from bot.keyboards.session import CachedMarkupSession
+from services.language_service import CatalogWatcher, get_lang_service
+from services.outbox import outbox
+from services.file_service import FileService
+from services.image_pipeline import image_pipeline
+from services.media_fetcher import media_fetcher
+from services.spam_filter import spam_filter
+from database.repositories.application_repository import APPLICATION_SUBMITTED
+from bot.handlers.main.confirmation_handlers import notify_admins
 
 load_dotenv()
 setup_logging()
@@ -25,36 +50,88 @@ logger = logging.getLogger(__name__)
 WEBHOOK_PATH = "/webhook/bot"
 WEBHOOK_SECRET = "mysecrettoken"
 
-bot = Bot(token=config.bot_token)
-dp = Dispatcher()
+
+def create_storage() -> BaseStorage:
+    """Redis when it is shared by several workers, otherwise the user table
+
+    Either way user.state follows the FSM without extra writes in handlers.
+    """
+    redis = get_redis()
+    if redis:
+        return ProjectedStorage(RedisStorage(redis=redis))
+    return DatabaseStorage()
+
+
+bot = Bot(token=config.bot_token, session=CachedMarkupSession())
+bot.session.middleware(CommitBeforeRequest())
+dp = Dispatcher(storage=create_storage())
+update_queue = UpdateQueue(dp, bot, workers=config.update_workers, maxsize=config.update_queue_size)
+update_dedup = UpdateDeduplicator(redis=get_redis())
+catalog_watcher = CatalogWatcher(interval=config.lang_watch_interval)
+
+
+def throttling_stage(redis: Optional[Redis]) -> Stage:
+    """Separate budgets for typed messages and button presses
+
+    One Redis client decides both the limiter backend and the cost tier.
+    """
+    def build(observer: str) -> ThrottlingMiddleware:
+        return ThrottlingMiddleware(
+            calls=1,
+            per=1,
+            warning_message="⏳ Iltimos, sekinroq yozing!",
+            limiter=RedisGCRALimiter(redis, calls=1, per=1, prefix=f"throttle:{observer}:") if redis else None
+        )
+
+    return Stage("throttling", build, cost=NETWORK if redis else MEMORY)
+
+
+middleware_pipeline = MiddlewarePipeline([
+    Stage("private_chat", lambda _: PrivateChatOnlyMiddleware()),
+    Stage("anti_spam", lambda _: AntiSpamMiddleware(), observers=("message",)),
+    throttling_stage(get_redis()),
+    Stage("database", lambda _: DatabaseMiddleware(), cost=DATABASE),
+    Stage("auth", lambda _: AuthMiddleware(), cost=DATABASE),
+])
 
 
 def setup_middlewares():
-    dp.message.middleware(ThrottlingMiddleware(
-        calls=1,
-        per=1,
-        warning_message="⏳ Iltimos, sekinroq yozing!"
-    ))
-    dp.message.middleware(PrivateChatOnlyMiddleware())
-    dp.message.middleware(AuthMiddleware())
-    dp.message.middleware(AntiSpamMiddleware())
+    middleware_pipeline.setup(dp)
 
 
 async def on_startup():
     await init_db()
     logger.info("Database initialized")
+    app_buffer.start()
+    FileService.store.start()
     setup_middlewares()
+    Keyboards.rebuild()
+    get_lang_service().on_reload(Keyboards.rebuild)
+    catalog_watcher.start()
     register_handlers(dp)
     logger.info("Handlers registered")
+    outbox.register(APPLICATION_SUBMITTED, notify_admins)
+    outbox.start(bot)
+    media_fetcher.start(bot)
 
 
 async def on_shutdown():
+    await catalog_watcher.stop()
+    await outbox.stop()
+    await media_fetcher.stop()
+    await image_pipeline.close()
+    await FileService.store.stop()
+    await app_buffer.stop()
+    await dp.storage.close()
+    await close_redis()
+    await notifier.close()
     await bot.session.close()
     logger.info("Bot stopped")
 
 
 async def polling():
     await on_startup()
+    dp.update.outer_middleware(DeduplicationMiddleware(update_dedup))
     logger.info("Bot started in polling mode")
     await dp.start_polling(bot)
     await on_shutdown()
@@ -63,8 +140,10 @@ async def polling():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await on_startup()
+    update_queue.start()
     logger.info("Bot started in webhook mode")
     yield
+    await update_queue.stop()
     await on_shutdown()
 
 app = FastAPI(lifespan=lifespan)
@@ -73,7 +152,13 @@ def create_app() -> FastAPI:
     @app.post(WEBHOOK_PATH)
     async def webhook(request: Request) -> Response:
         update = await request.json()
-        await dp.feed_raw_update(bot, update)
+        # Telegram retries and other workers may deliver the same update
+        if not await update_dedup.is_new(update.get("update_id")):
+            return Response()
+        # Answer Telegram right away - handlers run in the background
+        if not await update_queue.put(update):
+            await update_dedup.forget(update.get("update_id"))
+            return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
         return Response()
 
     return app
@@ -82,7 +167,21 @@ def create_app() -> FastAPI:
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "status_code": status.HTTP_200_OK}
+    return {
+        "status": "healthy",
+        "status_code": status.HTTP_200_OK,
+        "updates": {**update_queue.stats(), "duplicates": update_dedup.duplicates},
+        "outbox": outbox.stats(),
+        "downloads": FileService.stats.as_dict(),
+        "media": {
+            **FileService.store.stats(),
+            "images": image_pipeline.stats(),
+            "fetch": media_fetcher.stats(),
+        },
+        "languages": catalog_watcher.stats(),
+        "spam": spam_filter.stats(),
+        "middlewares": middleware_pipeline.stats(),
+    }
 
 @app.get("/")
 async def health() -> Response:
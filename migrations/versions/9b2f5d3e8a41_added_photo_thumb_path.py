@@ -0,0 +1,29 @@
+"""added photo_thumb_path
+
+Revision ID: 9b2f5d3e8a41
+Revises: 4c1e7a9d2b6f
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b2f5d3e8a41'
+down_revision: Union[str, Sequence[str], None] = '4c1e7a9d2b6f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('application', sa.Column('photo_thumb_path', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("application") as batch_op:
+        batch_op.drop_column('photo_thumb_path')
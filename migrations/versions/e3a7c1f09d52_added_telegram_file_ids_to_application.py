@@ -0,0 +1,35 @@
+"""added telegram file ids to application
+
+Revision ID: e3a7c1f09d52
+Revises: 9b2f5d3e8a41
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3a7c1f09d52'
+down_revision: Union[str, Sequence[str], None] = '9b2f5d3e8a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('application', sa.Column('photo_file_id', sa.String(), nullable=True))
+    op.add_column('application', sa.Column('photo_file_unique_id', sa.String(), nullable=True))
+    op.add_column('application', sa.Column('resume_file_id', sa.String(), nullable=True))
+    op.add_column('application', sa.Column('resume_file_unique_id', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("application") as batch_op:
+        batch_op.drop_column('resume_file_unique_id')
+        batch_op.drop_column('resume_file_id')
+        batch_op.drop_column('photo_file_unique_id')
+        batch_op.drop_column('photo_file_id')
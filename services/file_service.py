@@ -1,34 +1,129 @@
-
 import os
+import time
 import uuid
-import aiofiles
 from aiogram import Bot
-from aiogram.types import PhotoSize
+from aiogram.types import PhotoSize, Document, Voice
+
+from services.media_store import MediaStore
 
+# Downloads land in TMP_DIR and move into the content-addressed store when complete.
+# Files in the older per-kind directories are still served and garbage collected.
+TMP_DIR = "media/tmp"
 PHOTOS_DIR = "media/photos"
-os.makedirs(PHOTOS_DIR, exist_ok=True)
+DOCUMENTS_DIR = "media/documents"
+VOICES_DIR = "media/voices"
+os.makedirs(TMP_DIR, exist_ok=True)
+
+# Bot API serves files up to 20 MB - anything bigger is rejected before downloading
+MAX_PHOTO_SIZE = 10 * 1024 * 1024
+MAX_DOCUMENT_SIZE = 20 * 1024 * 1024
+MAX_VOICE_SIZE = 10 * 1024 * 1024
+
+CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = 60
+
+
+class DownloadStats:
+    """Counters of FileService downloads"""
+
+    __slots__ = ("downloads", "failed", "rejected", "bytes", "seconds")
+
+    def __init__(self):
+        self.downloads = 0
+        self.failed = 0
+        self.rejected = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "downloads": self.downloads,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "bytes": self.bytes,
+            "avg_ms": round(self.seconds / self.downloads * 1000, 1) if self.downloads else 0.0,
+        }
 
 
 class FileService:
 
+    stats = DownloadStats()
+    store = MediaStore(legacy_dirs=(PHOTOS_DIR, DOCUMENTS_DIR, VOICES_DIR, TMP_DIR))
+
     @staticmethod
-    async def download_photo(bot: Bot, photo: PhotoSize, user_id: int) -> str | None:
+    async def download(
+        bot: Bot,
+        file_id: str,
+        user_id: int,
+        max_size: int,
+        default_ext: str,
+        file_size: int | None = None
+    ) -> str | None:
+        """
+        Stream a Telegram file to disk chunk by chunk
+
+        The file is written to TMP_DIR and moved into the media store when
+        complete, so a failed download never leaves a truncated file behind
+        and identical files are kept once.
+        """
+        stats = FileService.stats
+        if file_size and file_size > max_size:
+            stats.rejected += 1
+            print(f"[FileService] {file_id} too large: {file_size} bytes")
+            return None
+
+        started = time.perf_counter()
+        tmp_path = None
         try:
-            file = await bot.get_file(photo.file_id)
-            ext = file.file_path.rsplit(".", 1)[-1] if "." in file.file_path else "jpg"
-            filename = f"{user_id}_{uuid.uuid4().hex}.{ext}"
-            filepath = os.path.join(PHOTOS_DIR, filename)
+            file = await bot.get_file(file_id)
+            if file.file_size and file.file_size > max_size:
+                stats.rejected += 1
+                print(f"[FileService] {file_id} too large: {file.file_size} bytes")
+                return None
 
-            file_bytes = await bot.download_file(file.file_path)
+            ext = file.file_path.rsplit(".", 1)[-1] if "." in file.file_path else default_ext
+            tmp_path = os.path.join(TMP_DIR, f"{user_id}_{uuid.uuid4().hex}.part")
 
-            async with aiofiles.open(filepath, "wb") as f:
-                await f.write(file_bytes.read())
+            await bot.download_file(
+                file.file_path,
+                destination=tmp_path,
+                timeout=DOWNLOAD_TIMEOUT,
+                chunk_size=CHUNK_SIZE
+            )
 
+            size = os.path.getsize(tmp_path)
+            if size > max_size:
+                stats.rejected += 1
+                print(f"[FileService] {file_id} too large: {size} bytes")
+                return None
+            filepath = await FileService.store.put(tmp_path, ext)
+            tmp_path = None
+
+            stats.downloads += 1
+            stats.bytes += size
+            stats.seconds += time.perf_counter() - started
             return filepath
 
         except Exception as e:
-            print(f"[FileService] download_photo failed: {e}")
+            stats.failed += 1
+            print(f"[FileService] download failed: {e}")
             return None
+        finally:
+            if tmp_path:
+                FileService.delete_file(tmp_path)
+
+    @staticmethod
+    async def download_photo(bot: Bot, photo: PhotoSize, user_id: int) -> str | None:
+        return await FileService.download(bot, photo.file_id, user_id, MAX_PHOTO_SIZE, "jpg", photo.file_size)
+
+    @staticmethod
+    async def download_document(bot: Bot, document: Document, user_id: int) -> str | None:
+        ext = document.file_name.rsplit(".", 1)[-1].lower() if document.file_name and "." in document.file_name else "bin"
+        return await FileService.download(bot, document.file_id, user_id, MAX_DOCUMENT_SIZE, ext, document.file_size)
+
+    @staticmethod
+    async def download_voice(bot: Bot, voice: Voice, user_id: int) -> str | None:
+        return await FileService.download(bot, voice.file_id, user_id, MAX_VOICE_SIZE, "ogg", voice.file_size)
 
     @staticmethod
     def delete_file(filepath: str) -> None:
@@ -36,4 +131,4 @@ class FileService:
             if filepath and os.path.exists(filepath):
                 os.remove(filepath)
         except Exception as e:
-            print(f"[FileService] delete_file failed: {e}")
\ No newline at end of file
+            print(f"[FileService] delete_file failed: {e}")
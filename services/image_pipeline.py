@@ -0,0 +1,125 @@
+"""
+🖼 Applicant photo normalization and thumbnails (off the event loop)
+"""
+import asyncio
+import logging
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+from database.db import DB
+from services.file_service import FileService, TMP_DIR
+from services.media_cache import media_cache
+
+logger = logging.getLogger(__name__)
+
+_EXTENSIONS = {"JPEG": "jpg", "WEBP": "webp"}
+
+
+def _save(image: Image.Image, max_side: int, fmt: str, quality: int) -> str:
+    image = image.copy()
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+    path = os.path.join(TMP_DIR, f"{uuid.uuid4().hex}.part")
+    image.save(path, fmt, quality=quality, optimize=True)
+    return path
+
+
+def render(src: str, max_side: int, thumb_side: int, fmt: str, quality: int) -> tuple[str, str]:
+    """
+    Runs in a worker process - writes (normalized, thumbnail) into TMP_DIR
+
+    EXIF rotation is applied and metadata dropped, images never grow.
+    """
+    with Image.open(src) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        return _save(image, max_side, fmt, quality), _save(image, thumb_side, fmt, quality)
+
+
+class ImagePipeline:
+    """
+    Replaces an uploaded photo with a normalized copy plus a thumbnail
+
+    Resizing is CPU bound, so it runs in a ProcessPoolExecutor; results go
+    to the media store and application.photo_path / photo_thumb_path are
+    swapped only if the applicant has not sent a different photo meanwhile.
+    The original is left to media GC.
+
+    Usage:
+        image_pipeline.submit(app_id, photo_path)
+        await image_pipeline.close()
+    """
+
+    def __init__(
+        self,
+        max_side: int = 1280,
+        thumb_side: int = 320,
+        fmt: str = "JPEG",
+        quality: int = 85,
+        workers: int = 2
+    ):
+        self.max_side = max_side
+        self.thumb_side = thumb_side
+        self.fmt = fmt
+        self.quality = quality
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.processed = 0
+        self.failed = 0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def submit(self, app_id: int, path: str) -> asyncio.Task:
+        task = asyncio.create_task(self.process(app_id, path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def process(self, app_id: int, path: str) -> bool:
+        """Normalize one photo - True if the application now points at it"""
+        tmp_paths: tuple[str, ...] = ()
+        try:
+            loop = asyncio.get_running_loop()
+            tmp_paths = await loop.run_in_executor(
+                self._executor(), render, path, self.max_side, self.thumb_side, self.fmt, self.quality
+            )
+            ext = _EXTENSIONS.get(self.fmt, self.fmt.lower())
+            normalized = await FileService.store.put(tmp_paths[0], ext)
+            thumb = await FileService.store.put(tmp_paths[1], ext)
+            tmp_paths = ()
+
+            replaced = await DB.app.replace_photo(app_id, path, normalized, thumb)
+            if replaced:
+                # Same picture - keep sending the file_id Telegram already has
+                media_cache.remember(normalized, media_cache.get(path))
+            self.processed += 1
+            return replaced
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Photo processing failed for application {app_id}: {e}")
+            return False
+        finally:
+            for tmp_path in tmp_paths:
+                FileService.delete_file(tmp_path)
+
+    async def close(self, timeout: float = 30.0) -> None:
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def stats(self) -> dict[str, int]:
+        return {"processed": self.processed, "failed": self.failed, "in_flight": len(self._tasks)}
+
+
+image_pipeline = ImagePipeline()
@@ -1,16 +1,169 @@
 """
 🌐 Fixed Language Service
 """
+import asyncio
+import hashlib
+import logging
+import os
+import msgpack
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from string import Formatter
+from typing import Dict, Any, Callable, List, Mapping, NamedTuple, Optional, Tuple
+
+# Compiled entry: (text, placeholders, formatter)
+#   placeholders is None when the text needs no formatting,
+#   formatter is None when str.format_map has to handle it (format specs, attributes, ...)
+Render = Callable[[Mapping[str, Any]], str]
+Entry = Tuple[str, Optional[frozenset], Optional[Render]]
+
+logger = logging.getLogger(__name__)
+
+# languages/.compiled/<lang>.msgpack - flattened catalog keyed by the YAML hash
+CACHE_DIR = ".compiled"
+CACHE_VERSION = 1
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def flatten(tree: Dict[str, Any], prefix: str = "") -> Dict[str, str]:
+    """{"a": {"b": "x"}} -> {"a.b": "x"} - only string leaves are translations"""
+    flat: Dict[str, str] = {}
+    for key, value in tree.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{path}."))
+        elif isinstance(value, str):
+            flat[path] = value
+    return flat
+
+
+def _compile_formatter(fields: list) -> Optional[Render]:
+    """
+    Turn a parsed template into an f-string lambda
+
+    "Hi, {name}!" -> lambda _kw: f"{_l0}{_kw['name']}{_l1}" with the literal
+    parts bound as constants - no template parsing left at call time.
+    """
+    namespace: Dict[str, Any] = {}
+    pieces = []
+    for i, (literal, field, spec, conversion) in enumerate(fields):
+        if literal:
+            namespace[f"_l{i}"] = literal
+            pieces.append(f"{{_l{i}}}")
+        if field is None:
+            continue
+        if not field.isidentifier() or spec or conversion:
+            return None
+        pieces.append(f"{{_kw[{field!r}]}}")
+    return eval('lambda _kw: f"' + "".join(pieces) + '"', namespace)
+
+
+def compile_entry(text: str) -> Entry:
+    """Parse a template once, at load time"""
+    if "{" not in text and "}" not in text:
+        return text, None, None
+    try:
+        fields = list(Formatter().parse(text))
+    except ValueError:
+        # Malformed template - always shown as is
+        return text, None, None
+    names = frozenset(
+        field.split(".", 1)[0].split("[", 1)[0]
+        for _, field, _, _ in fields
+        if field is not None
+    )
+    return text, names, _compile_formatter(fields)
+
+
+def compile_catalog(flat: Dict[str, str]) -> Dict[str, Entry]:
+    return {key: compile_entry(text) for key, text in flat.items()}
+
+
+def _cache_path(lang_file: Path) -> Path:
+    return lang_file.parent / CACHE_DIR / f"{lang_file.stem}.msgpack"
+
+
+def load_flat(lang_file: Path, write_cache: bool = True) -> Dict[str, str]:
+    """
+    Flattened catalog of one YAML file
+
+    Served from the msgpack cache when it was built from the same YAML bytes,
+    otherwise the YAML is parsed and the cache rewritten.
+    """
+    raw = lang_file.read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    cache_path = _cache_path(lang_file)
+    try:
+        cached = msgpack.unpackb(cache_path.read_bytes())
+        if cached.get("version") == CACHE_VERSION and cached.get("source") == digest:
+            return cached["catalog"]
+    except (OSError, ValueError, msgpack.UnpackException, AttributeError):
+        pass
+
+    flat = flatten(yaml.load(raw, Loader=_YAML_LOADER) or {})
+    if write_cache:
+        try:
+            cache_path.parent.mkdir(exist_ok=True)
+            tmp_path = cache_path.with_suffix(".part")
+            tmp_path.write_bytes(msgpack.packb({"version": CACHE_VERSION, "source": digest, "catalog": flat}))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write catalog cache {cache_path}: {e}")
+    return flat
+
+
+def build_cache(lang_dir: Path) -> list:
+    """Compile every languages/*.yaml into its msgpack cache (build step)"""
+    built = []
+    for lang_file in sorted(lang_dir.glob("*.yaml")):
+        load_flat(lang_file)
+        built.append(_cache_path(lang_file))
+    return built
+
+
+def missing_keys(catalogs: Dict[str, Dict[str, Entry]]) -> Dict[str, set]:
+    """Keys some language has and another lacks - {lang: missing keys}"""
+    every = set().union(*catalogs.values()) if catalogs else set()
+    return {lang: every - catalog.keys() for lang, catalog in catalogs.items() if every - catalog.keys()}
+
+
+def build_button_index(catalogs: Dict[str, Dict[str, Entry]]) -> Dict[str, Tuple[str, str]]:
+    """Button text -> (button key, language) over all catalogs"""
+    index: Dict[str, Tuple[str, str]] = {}
+    for lang, catalog in catalogs.items():
+        for key, (text, _, _) in catalog.items():
+            if key.startswith("buttons."):
+                name = key[8:]
+                # Language buttons belong to the language they select;
+                # same text in several languages - the first catalog wins
+                index.setdefault(text, (name, name if name in catalogs else lang))
+    return index
+
+
+class CatalogSnapshot(NamedTuple):
+    """Everything derived from the YAML files - swapped as a whole on reload"""
+    catalogs: Dict[str, Dict[str, Entry]]
+    buttons: Dict[str, Tuple[str, str]]
+    mtimes: Dict[str, float]
 
 
 class LanguageService:
-    """Language service with caching"""
+    """
+    Language service with caching
+
+    Every languages/*.yaml is flattened to {"dotted.key": entry} when loaded,
+    so a lookup is a single dict access, and templates are compiled to
+    formatters that run only when all of their placeholders are given.
+    Flattened catalogs are cached as msgpack next to the YAML files.
+    """
     _instance: Optional["LanguageService"] = None
-    _languages: Dict[str, Dict[str, Any]] = {}
+    _catalogs: Dict[str, Dict[str, Entry]] = {}
+    _buttons: Dict[str, Tuple[str, str]] = {}
     _loaded: bool = False
+    _lang_dir: Optional[Path] = None
+    _mtimes: Dict[str, float] = {}
+    _rejected: Dict[str, float] = {}
+    _listeners: List[Callable[[], None]] = []
 
     def __new__(cls) -> "LanguageService":
         if cls._instance is None:
@@ -22,58 +175,130 @@ class LanguageService:
             self._load_languages()
             LanguageService._loaded = True
 
-    def _load_languages(self) -> None:
-        """Load all language files"""
+    @staticmethod
+    def _find_dir() -> Optional[Path]:
         possible_paths = [
             Path(__file__).parent.parent / "languages",
             Path(__file__).parent.parent.parent / "languages",
             Path("languages"),
             Path("./languages"),
         ]
-        
-        lang_dir = None
         for path in possible_paths:
             if path.exists():
-                lang_dir = path
-                break
-        
+                return path
+        return None
+
+    @staticmethod
+    def _read(lang_file: Path) -> Dict[str, Entry]:
+        return compile_catalog(load_flat(lang_file))
+
+    def _load_languages(self) -> None:
+        """Load all language files"""
+        lang_dir = self._find_dir()
         if not lang_dir:
-            print("WARNING: Languages directory not found!")
+            logger.warning("Languages directory not found!")
             return
-        
+        LanguageService._lang_dir = lang_dir
+
         for lang_file in lang_dir.glob("*.yaml"):
             lang_code = lang_file.stem
             try:
-                with open(lang_file, "r", encoding="utf-8") as f:
-                    LanguageService._languages[lang_code] = yaml.safe_load(f)
-                print(f"Loaded language: {lang_code}")
+                mtime = lang_file.stat().st_mtime
+                LanguageService._catalogs[lang_code] = self._read(lang_file)
+                LanguageService._mtimes[lang_code] = mtime
             except Exception as e:
-                print(f"Error loading {lang_file}: {e}")
+                logger.error(f"Error loading {lang_file}: {e}")
+        logger.info(f"Loaded languages: {', '.join(LanguageService._catalogs)}")
+        for lang_code, missing in missing_keys(LanguageService._catalogs).items():
+            logger.warning(f"{lang_code} is missing {len(missing)} keys: {', '.join(sorted(missing)[:5])}")
+        LanguageService._buttons = build_button_index(LanguageService._catalogs)
+
+    # ==================== HOT RELOAD ====================
+
+    def on_reload(self, callback: Callable[[], None]) -> None:
+        """Call callback after new catalogs are swapped in (rebuild derived caches)"""
+        LanguageService._listeners.append(callback)
+
+    def prepare_reload(self) -> Optional[CatalogSnapshot]:
+        """
+        Re-parse changed catalogs - blocking, meant for a worker thread
+
+        Returns None when nothing changed. Raises ValueError when the new
+        catalogs are unusable: a file does not parse, a language disappeared
+        or the languages no longer share the same key set.
+        """
+        lang_dir = self._lang_dir or self._find_dir()
+        if lang_dir is None:
+            return None
+        mtimes = {f.stem: f.stat().st_mtime for f in lang_dir.glob("*.yaml")}
+        changed = [lang for lang, mtime in mtimes.items() if self._mtimes.get(lang) != mtime]
+        if not changed or all(self._rejected.get(lang) == mtimes[lang] for lang in changed):
+            return None
+
+        try:
+            removed = set(self._catalogs) - set(mtimes)
+            if removed:
+                raise ValueError(f"language files disappeared: {', '.join(sorted(removed))}")
+            catalogs = dict(self._catalogs)
+            for lang in changed:
+                try:
+                    catalogs[lang] = self._read(lang_dir / f"{lang}.yaml")
+                except Exception as e:
+                    raise ValueError(f"{lang}.yaml: {e}") from e
+            missing = missing_keys(catalogs)
+            if missing:
+                raise ValueError("; ".join(
+                    f"{lang} is missing {', '.join(sorted(keys)[:5])}" for lang, keys in missing.items()
+                ))
+        except ValueError:
+            # Reported once per file version, retried when the file changes again
+            LanguageService._rejected.update({lang: mtimes[lang] for lang in changed})
+            raise
+        return CatalogSnapshot(catalogs, build_button_index(catalogs), mtimes)
+
+    def apply(self, snapshot: CatalogSnapshot) -> None:
+        """Swap in new catalogs - no await in between, readers see old or new"""
+        LanguageService._catalogs = snapshot.catalogs
+        LanguageService._buttons = snapshot.buttons
+        LanguageService._mtimes = snapshot.mtimes
+        LanguageService._rejected = {}
+        for callback in self._listeners:
+            callback()
+
+    async def reload(self) -> bool:
+        """Reload changed catalogs off the event loop - True if anything was swapped"""
+        snapshot = await asyncio.to_thread(self.prepare_reload)
+        if snapshot is None:
+            return False
+        self.apply(snapshot)
+        return True
 
     def get(self, lang: str, key: str, **kwargs) -> str:
-        if lang not in self._languages:
-            lang = "uz"
-        
-        value = self._languages.get(lang, {})
-        keys = key.split(".")
-        
-        for k in keys:
-            if not isinstance(value, dict):
-                return key
-            if k not in value:
-                return key
-            value = value[k]
-        
-        if not isinstance(value, str):
+        catalog = self._catalogs.get(lang)
+        if catalog is None:
+            catalog = self._catalogs.get("uz", {})
+
+        entry = catalog.get(key)
+        if entry is None:
             return key
-        
-        if kwargs:
-            try:
-                return value.format(**kwargs)
-            except KeyError:
-                return value
-        
-        return value
+
+        text, names, formatter = entry
+        # A missing placeholder leaves the template untouched (as str.format's KeyError did)
+        if kwargs and names is not None and names <= kwargs.keys():
+            return formatter(kwargs) if formatter is not None else text.format_map(kwargs)
+        return text
+
+    def match_button(self, text: str) -> Optional[Tuple[str, str]]:
+        """(button key, language) of a button text in any language"""
+        return self._buttons.get(text)
+
+    def languages(self) -> tuple:
+        """Codes of the loaded languages"""
+        return tuple(self._catalogs)
+
+    def keys(self, lang: str) -> frozenset:
+        """All translation keys of a language"""
+        return frozenset(self._catalogs.get(lang, ()))
 
 
 # Singleton instance
@@ -90,9 +315,73 @@ def get_lang_service() -> LanguageService:
 
 def t(lang: str, key: str, **kwargs) -> str:
     """Quick translate function"""
-    return get_lang_service().get(lang, key, **kwargs)
+    return (_lang_service or get_lang_service()).get(lang, key, **kwargs)
 
 
 def btn(lang: str, key: str) -> str:
     """Quick button text function"""
-    return get_lang_service().get(lang, f"buttons.{key}")
+    return (_lang_service or get_lang_service()).get(lang, f"buttons.{key}")
+
+
+class CatalogWatcher:
+    """
+    Polls languages/*.yaml mtimes and hot-reloads changed catalogs
+
+    A catalog that fails to parse or validate is reported and the running
+    catalogs stay in place until the file is fixed.
+
+    Usage:
+        watcher = CatalogWatcher(interval=5)
+        watcher.start()
+        await watcher.stop()
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+        self.reloads = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._run(), name="catalog-watcher")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        service = get_lang_service()
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                if await service.reload():
+                    self.reloads += 1
+                    logger.info(f"Reloaded languages: {', '.join(service.languages())}")
+            except Exception as e:
+                self.rejected += 1
+                logger.error(f"Language reload rejected: {e}")
+
+    def stats(self) -> dict[str, int]:
+        return {"reloads": self.reloads, "rejected": self.rejected}
+
+
+def match_button(text: str) -> Optional[Tuple[str, str]]:
+    """Which button (and in which language) a message text is"""
+    return (_lang_service or get_lang_service()).match_button(text)
+
+
+if __name__ == "__main__":
+    # Build step: python -m services.language_service
+    logging.basicConfig(level=logging.INFO)
+    lang_dir = LanguageService._find_dir()
+    if lang_dir is None:
+        raise SystemExit("Languages directory not found")
+    for path in build_cache(lang_dir):
+        print(f"Compiled {path}")
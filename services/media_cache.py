@@ -0,0 +1,96 @@
+"""
+🗂 Telegram file_id cache for locally stored media
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from aiogram.methods import SendMediaGroup, TelegramMethod
+from aiogram.types import FSInputFile, Message
+
+# Method field that carries the media -> how to read file_id from the sent Message
+_MEDIA_FIELDS = {
+    "photo": lambda m: m.photo[-1].file_id if m.photo else None,
+    "document": lambda m: m.document.file_id if m.document else None,
+    "voice": lambda m: m.voice.file_id if m.voice else None,
+}
+
+
+class MediaCache:
+    """
+    Maps a local file path to the file_id Telegram assigned to it
+
+    A file is uploaded at most once - every later send of the same path
+    reuses the file_id. Entries come from the original upload of the user
+    (remember) or from the result of the first send (remember_sent).
+
+    Usage:
+        photo = media_cache.input_file(app.photo_path)   # file_id or FSInputFile
+        msg = await message.answer_photo(photo)
+        media_cache.remember_sent(SendPhoto(chat_id=..., photo=photo), msg)
+    """
+
+    __slots__ = ("max_size", "_items", "hits", "misses")
+
+    def __init__(self, max_size: int = 50_000):
+        self.max_size = max_size
+        self._items: OrderedDict[str, str] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @staticmethod
+    def _key(path: Union[str, Path]) -> str:
+        return str(path)
+
+    def get(self, path: Union[str, Path]) -> Optional[str]:
+        key = self._key(path)
+        file_id = self._items.get(key)
+        if file_id is not None:
+            self._items.move_to_end(key)
+        return file_id
+
+    def remember(self, path: Union[str, Path], file_id: Optional[str]) -> None:
+        if not path or not file_id:
+            return
+        key = self._key(path)
+        self._items[key] = file_id
+        self._items.move_to_end(key)
+        if len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, path: Union[str, Path]) -> None:
+        """Forget a file_id Telegram no longer accepts (or a deleted file)"""
+        self._items.pop(self._key(path), None)
+
+    def input_file(self, path: Union[str, Path]) -> Union[str, FSInputFile]:
+        """Cached file_id, or the file itself to upload on a miss"""
+        file_id = self.get(path)
+        if file_id is not None:
+            self.hits += 1
+            return file_id
+        self.misses += 1
+        return FSInputFile(path)
+
+    def remember_sent(self, method: TelegramMethod, result: Any) -> None:
+        """Record file_ids of files a method uploaded - notifier on_sent hook"""
+        if isinstance(method, SendMediaGroup) and isinstance(result, list):
+            for item, message in zip(method.media, result):
+                extract = _MEDIA_FIELDS.get(item.type)
+                if extract is not None and isinstance(item.media, FSInputFile):
+                    self.remember(item.media.path, extract(message))
+            return
+        if not isinstance(result, Message):
+            return
+        for field, extract in _MEDIA_FIELDS.items():
+            media = getattr(method, field, None)
+            if isinstance(media, FSInputFile):
+                self.remember(media.path, extract(result))
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+media_cache = MediaCache()
@@ -0,0 +1,126 @@
+"""
+📥 Deferred download of applicant media (LAZY_MEDIA)
+"""
+import asyncio
+import logging
+from typing import Optional
+
+from aiogram import Bot
+
+from database.db import DB
+from database.models.application import Application
+from services.file_service import FileService, MAX_PHOTO_SIZE, MAX_DOCUMENT_SIZE
+from services.image_pipeline import image_pipeline
+from services.media_cache import media_cache
+
+logger = logging.getLogger(__name__)
+
+
+class MediaFetcher:
+    """
+    Downloads photos / resumes that were stored as Telegram file_ids only
+
+    Drafts are never fetched - an abandoned questionnaire costs no download.
+    Submitted applications are swept every interval (and right after a
+    submit via wake()); fetch_app() downloads one application on demand.
+    A file that keeps failing is skipped after max_attempts in this process.
+
+    Usage:
+        media_fetcher.start(bot)
+        after_commit(media_fetcher.wake)
+        app = await media_fetcher.fetch_app(app_id)
+    """
+
+    def __init__(self, interval: float = 60.0, batch_size: int = 50, max_attempts: int = 3):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._bot: Optional[Bot] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._attempts: dict[str, int] = {}
+
+        self.fetched = 0
+        self.failed = 0
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def start(self, bot: Bot) -> None:
+        self._bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="media-fetcher")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Media fetch sweep failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def sweep(self) -> int:
+        """Fetch media of every submitted application that still lacks files"""
+        fetched, after_id = 0, 0
+        while True:
+            apps = await DB.app.get_missing_media(after_id, self.batch_size)
+            if not apps:
+                return fetched
+            for app in apps:
+                fetched += await self._fetch(app)
+            after_id = apps[-1].id
+
+    async def fetch_app(self, app_id: int) -> Optional[Application]:
+        """Make sure the application's files are on disk, returns the fresh row"""
+        app = await DB.app.get(app_id)
+        if app is not None and await self._fetch(app):
+            app = await DB.app.get(app_id)
+        return app
+
+    async def _fetch(self, app: Application) -> int:
+        fetched = 0
+        if app.photo_file_id and not app.photo_path:
+            path = await self._download(app.photo_file_id, app.user_id, MAX_PHOTO_SIZE, "jpg")
+            if path and await DB.app.attach_photo(app.id, app.photo_file_id, path):
+                media_cache.remember(path, app.photo_file_id)
+                image_pipeline.submit(app.id, path)
+                fetched += 1
+        if app.resume_file_id and not app.resume_path:
+            path = await self._download(app.resume_file_id, app.user_id, MAX_DOCUMENT_SIZE, "bin")
+            if path and await DB.app.attach_resume(app.id, app.resume_file_id, path):
+                media_cache.remember(path, app.resume_file_id)
+                fetched += 1
+        return fetched
+
+    async def _download(self, file_id: str, user_id: int, max_size: int, default_ext: str) -> Optional[str]:
+        if self._bot is None or self._attempts.get(file_id, 0) >= self.max_attempts:
+            return None
+        path = await FileService.download(self._bot, file_id, user_id, max_size, default_ext)
+        if path is None:
+            self._attempts[file_id] = self._attempts.get(file_id, 0) + 1
+            self.failed += 1
+            if self._attempts[file_id] >= self.max_attempts:
+                logger.error(f"Giving up on Telegram file {file_id} of user {user_id}")
+            return None
+        self._attempts.pop(file_id, None)
+        self.fetched += 1
+        return path
+
+    def stats(self) -> dict[str, int]:
+        return {"fetched": self.fetched, "failed": self.failed}
+
+
+media_fetcher = MediaFetcher()
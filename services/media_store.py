@@ -0,0 +1,142 @@
+"""
+🗄 Content-addressed media store
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from typing import Iterable, Optional
+
+from database.db import DB
+
+logger = logging.getLogger(__name__)
+
+STORE_DIR = "media/store"
+
+
+class MediaStore:
+    """
+    Stores every file once, named by the SHA-256 of its content
+
+    media/store/ab/cd/abcd...ef.jpg - two levels of two hex characters keep
+    every directory small. Applications reference blobs by path
+    (photo_path / resume_path / *_voice_path), so a blob shared by several
+    applications is kept until the last of them lets go. A file no
+    application references is removed by collect_garbage() once it is older
+    than grace - a download that is not saved to its application yet survives.
+
+    Usage:
+        path = await FileService.store.put("media/tmp/x.part", "jpg")
+        removed = await FileService.store.collect_garbage()
+    """
+
+    def __init__(
+        self,
+        root: str = STORE_DIR,
+        legacy_dirs: Iterable[str] = (),
+        grace: float = 24 * 3600,
+        gc_interval: float = 6 * 3600
+    ):
+        self.root = root
+        self.legacy_dirs = tuple(legacy_dirs)
+        self.grace = grace
+        self.gc_interval = gc_interval
+        self._task: Optional[asyncio.Task] = None
+        os.makedirs(root, exist_ok=True)
+
+        self.stored = 0
+        self.deduplicated = 0
+        self.collected = 0
+
+    def path_for(self, digest: str, ext: str) -> str:
+        return os.path.join(self.root, digest[:2], digest[2:4], f"{digest}.{ext}")
+
+    @staticmethod
+    def _hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _put_sync(self, src: str, ext: str) -> str:
+        dest = self.path_for(self._hash_file(src), ext.lower())
+        if os.path.exists(dest):
+            os.remove(src)
+            # Fresh mtime - an orphan that is referenced again must outlive grace
+            os.utime(dest)
+            self.deduplicated += 1
+        else:
+            for _ in range(3):
+                os.makedirs(os.path.dirname(dest), exist_ok=True)
+                try:
+                    os.replace(src, dest)
+                    break
+                except FileNotFoundError:
+                    # Shard directory removed by a concurrent GC sweep
+                    if not os.path.exists(src):
+                        raise
+            else:
+                raise OSError(f"could not store {src}")
+            self.stored += 1
+        return dest
+
+    async def put(self, src: str, ext: str) -> str:
+        """Move a finished file into the store, returns its blob path"""
+        return await asyncio.to_thread(self._put_sync, src, ext)
+
+    def _sweep(self, refs: set[str], now: float) -> int:
+        removed = 0
+        for top in (self.root, *self.legacy_dirs):
+            for dirpath, _, filenames in os.walk(top, topdown=False):
+                for name in filenames:
+                    path = os.path.normpath(os.path.join(dirpath, name))
+                    if path in refs:
+                        continue
+                    try:
+                        if now - os.path.getmtime(path) > self.grace:
+                            os.remove(path)
+                            removed += 1
+                    except OSError:
+                        pass
+                # Drop emptied shard directories, never the roots
+                if dirpath != top and not os.listdir(dirpath):
+                    try:
+                        os.rmdir(dirpath)
+                    except OSError:
+                        pass
+        return removed
+
+    async def collect_garbage(self) -> int:
+        """Delete files no application references, returns number of removed files"""
+        refs = set(await DB.app.media_refs())
+        removed = await asyncio.to_thread(self._sweep, refs, time.time())
+        self.collected += removed
+        if removed:
+            logger.info(f"Media GC removed {removed} orphaned files")
+        return removed
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="media-gc")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.collect_garbage()
+            except Exception as e:
+                logger.error(f"Media GC failed: {e}")
+            await asyncio.sleep(self.gc_interval)
+
+    def stats(self) -> dict[str, int]:
+        return {"stored": self.stored, "deduplicated": self.deduplicated, "collected": self.collected}
@@ -0,0 +1,222 @@
+"""
+📣 Outbound notification dispatcher (admin fan-out)
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Iterable, Optional, Sequence, Union
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramNetworkError, TelegramRetryAfter
+from aiogram.methods import (
+    SendDocument, SendMediaGroup, SendMessage, SendPhoto, TelegramMethod
+)
+from aiogram.types import FSInputFile, InputMediaDocument, InputMediaPhoto
+
+logger = logging.getLogger(__name__)
+
+Build = Callable[[int], Sequence[TelegramMethod]]
+OnSent = Callable[[TelegramMethod, Any], None]
+InputFile = Union[str, FSInputFile]
+
+CAPTION_LIMIT = 1024
+MESSAGE_LIMIT = 4096
+MEDIA_GROUP_LIMIT = 10
+
+
+def _split(parts: Sequence[str], limit: int) -> list[str]:
+    """Join parts into as few texts as fit the limit (oversized parts are cut)"""
+    texts: list[str] = []
+    for part in parts:
+        while len(part) > limit:
+            texts.append(part[:limit])
+            part = part[limit:]
+        if texts and len(texts[-1]) + 2 + len(part) <= limit:
+            texts[-1] = f"{texts[-1]}\n\n{part}"
+        elif part:
+            texts.append(part)
+    return texts
+
+
+def compose(
+    chat_id: int,
+    parts: Sequence[str],
+    photos: Sequence[InputFile] = (),
+    documents: Sequence[InputFile] = ()
+) -> list[TelegramMethod]:
+    """
+    Pack text parts and files into the fewest Bot API calls
+
+    Leading parts that fit CAPTION_LIMIT become the caption of the first file,
+    the rest follow as messages. Telegram does not mix photos and documents
+    in one album, so each kind is sent as its own album (or single file).
+    """
+    groups = [(kind, files) for kind, files in (("photo", photos), ("document", documents)) if files]
+    if not groups:
+        return [SendMessage(chat_id=chat_id, text=text) for text in _split(parts, MESSAGE_LIMIT)]
+
+    caption, used = None, 0
+    for part in parts:
+        candidate = part if caption is None else f"{caption}\n\n{part}"
+        if len(candidate) > CAPTION_LIMIT:
+            break
+        caption, used = candidate, used + 1
+
+    methods: list[TelegramMethod] = []
+    for kind, files in groups:
+        for start in range(0, len(files), MEDIA_GROUP_LIMIT):
+            batch = files[start:start + MEDIA_GROUP_LIMIT]
+            if len(batch) == 1 and kind == "photo":
+                methods.append(SendPhoto(chat_id=chat_id, photo=batch[0], caption=caption))
+            elif len(batch) == 1:
+                methods.append(SendDocument(chat_id=chat_id, document=batch[0], caption=caption))
+            else:
+                input_media = InputMediaPhoto if kind == "photo" else InputMediaDocument
+                methods.append(SendMediaGroup(chat_id=chat_id, media=[
+                    input_media(media=file, caption=caption if i == 0 else None)
+                    for i, file in enumerate(batch)
+                ]))
+            caption = None
+    methods += [SendMessage(chat_id=chat_id, text=text) for text in _split(parts[used:], MESSAGE_LIMIT)]
+    return methods
+
+
+class _Pacer:
+    """Async token bucket - acquire() waits for the next free slot"""
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class NotificationDispatcher:
+    """
+    Sends notifications to many chats without blocking the caller
+
+    - recipients are served concurrently, messages of one recipient in order
+    - global limit (Telegram allows ~30 msg/s per bot) and per-chat limit
+    - waits retry_after and retries on TelegramRetryAfter / network errors
+    - build() runs when a recipient's turn comes, on_sent sees every result;
+      with prime_first the first recipient is served alone, so files it
+      uploads can be reused (as file_id) by everyone else
+
+    Usage:
+        notifier.submit(bot, ADMIN_IDS, lambda chat_id: compose(
+            chat_id, ["New application", details], photos=[photo]
+        ))
+    """
+
+    def __init__(
+        self,
+        rate: float = 30.0,
+        per_chat_rate: float = 1.0,
+        per_chat_burst: float = 3.0,
+        max_retries: int = 3
+    ):
+        self.max_retries = max_retries
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self._global = _Pacer(rate, rate)
+        self._chats: dict[int, _Pacer] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+
+    def _chat_pacer(self, chat_id: int) -> _Pacer:
+        pacer = self._chats.get(chat_id)
+        if pacer is None:
+            pacer = self._chats[chat_id] = _Pacer(self.per_chat_rate, self.per_chat_burst)
+        return pacer
+
+    async def _call(self, bot: Bot, method: TelegramMethod, chat_id: int):
+        for attempt in range(self.max_retries + 1):
+            await self._chat_pacer(chat_id).acquire()
+            await self._global.acquire()
+            try:
+                result = await bot(method)
+                self.sent += 1
+                return result
+            except TelegramRetryAfter as e:
+                if attempt == self.max_retries:
+                    raise
+                self.retried += 1
+                await asyncio.sleep(e.retry_after)
+            except TelegramNetworkError:
+                if attempt == self.max_retries:
+                    raise
+                self.retried += 1
+                await asyncio.sleep(2 ** attempt)
+
+    async def _deliver_one(
+        self,
+        bot: Bot,
+        chat_id: int,
+        build: Build,
+        on_sent: Optional[OnSent] = None
+    ) -> bool:
+        try:
+            for method in build(chat_id):
+                result = await self._call(bot, method, chat_id)
+                if on_sent is not None:
+                    on_sent(method, result)
+            return True
+        except (TelegramAPIError, OSError) as e:
+            self.failed += 1
+            logger.error(f"Failed to notify {chat_id}: {e}")
+            return False
+
+    async def deliver(
+        self,
+        bot: Bot,
+        chat_ids: Iterable[int],
+        build: Build,
+        on_sent: Optional[OnSent] = None,
+        prime_first: bool = False
+    ) -> dict[int, bool]:
+        """Send to all chats now and wait - {chat_id: delivered}"""
+        chat_ids = list(chat_ids)
+        results = []
+        if prime_first and chat_ids:
+            results.append(await self._deliver_one(bot, chat_ids[0], build, on_sent))
+        results += await asyncio.gather(
+            *(self._deliver_one(bot, chat_id, build, on_sent) for chat_id in chat_ids[len(results):])
+        )
+        return dict(zip(chat_ids, results))
+
+    def submit(
+        self,
+        bot: Bot,
+        chat_ids: Iterable[int],
+        build: Build,
+        on_sent: Optional[OnSent] = None,
+        prime_first: bool = False
+    ) -> asyncio.Task:
+        """Fire-and-forget deliver()"""
+        task = asyncio.create_task(self.deliver(bot, chat_ids, build, on_sent, prime_first))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def close(self, timeout: float = 30.0) -> None:
+        """Wait for notifications still in flight"""
+        if self._tasks:
+            await asyncio.wait(list(self._tasks), timeout=timeout)
+
+
+notifier = NotificationDispatcher()
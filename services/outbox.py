@@ -0,0 +1,149 @@
+"""
+📮 Outbox worker - delivers events committed to the outbox table
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram import Bot
+
+from database.config import async_session
+from database.repositories.outbox_repository import OutboxRepo
+
+logger = logging.getLogger(__name__)
+
+# handler(bot, payload) -> delivered; may update payload (e.g. who already got it)
+Handler = Callable[[Bot, dict[str, Any]], Awaitable[bool]]
+
+
+class OutboxWorker:
+    """
+    Drains the outbox table in batches
+
+    - events are claimed with a lease, so a crash mid-delivery only delays them
+    - a failed event is retried with exponential backoff (backoff * 2**attempt,
+      capped at max_backoff) and marked failed after max_attempts
+    - the worker polls every interval and wakes at once on wake()
+
+    Usage:
+        outbox.register(APPLICATION_SUBMITTED, notify_admins)
+        outbox.start(bot)
+        after_commit(outbox.wake)
+        await outbox.stop()
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 20,
+        interval: float = 5.0,
+        lease: float = 300.0,
+        max_attempts: int = 10,
+        backoff: float = 10.0,
+        max_backoff: float = 3600.0
+    ):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._handlers: dict[str, Handler] = {}
+        self._bot: Optional[Bot] = None
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def start(self, bot: Bot) -> None:
+        self._bot = bot
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="outbox-worker")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.drain()
+            except Exception as e:
+                logger.error(f"Outbox drain failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def drain(self) -> int:
+        """Deliver every due event, returns number of processed events"""
+        processed = 0
+        while True:
+            now = datetime.utcnow()
+            async with async_session() as s:
+                events = await OutboxRepo.claim(
+                    s, now, now + timedelta(seconds=self.lease), self.batch_size
+                )
+            if not events:
+                return processed
+
+            results = await asyncio.gather(*(self._handle(kind, payload) for _, kind, payload, _ in events))
+
+            sent, failures = [], []
+            for (event_id, kind, payload, attempts), error in zip(events, results):
+                if error is None:
+                    sent.append(event_id)
+                    continue
+                failed = attempts >= self.max_attempts
+                delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+                failures.append({
+                    "id": event_id,
+                    "payload": payload,
+                    "error": error,
+                    "available_at": datetime.utcnow() + timedelta(seconds=delay),
+                    "failed": failed,
+                })
+                if failed:
+                    self.failed += 1
+                    logger.error(f"Outbox event {event_id} ({kind}) gave up after {attempts} attempts: {error}")
+                else:
+                    self.retried += 1
+                    logger.warning(f"Outbox event {event_id} ({kind}) failed, retry in {delay:.0f}s: {error}")
+
+            async with async_session() as s:
+                await OutboxRepo.mark_sent(s, sent)
+                await OutboxRepo.reschedule(s, failures)
+            self.delivered += len(sent)
+            processed += len(events)
+
+    async def _handle(self, kind: str, payload: dict[str, Any]) -> Optional[str]:
+        """None on success, error text otherwise"""
+        handler = self._handlers.get(kind)
+        if handler is None:
+            return f"no handler for {kind!r}"
+        try:
+            if await handler(self._bot, payload):
+                return None
+            return "not delivered to every recipient"
+        except Exception as e:
+            return f"{type(e).__name__}: {e}"
+
+    def stats(self) -> dict[str, int]:
+        return {"delivered": self.delivered, "retried": self.retried, "failed": self.failed}
+
+
+outbox = OutboxWorker()
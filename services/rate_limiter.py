@@ -0,0 +1,152 @@
+"""
+⏱ Rate limiter engines
+"""
+import logging
+import time
+from itertools import islice
+from typing import Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class GCRALimiter:
+    """
+    In-process GCRA (generic cell rate algorithm) limiter
+
+    Stores one float per key - the theoretical arrival time (TAT).
+    A key whose TAT is in the past is indistinguishable from an unknown key,
+    so expired entries are dropped by periodic sweeps, and the number of
+    tracked keys never exceeds max_keys (least recently seen go first).
+
+    Usage:
+        limiter = GCRALimiter(calls=3, per=2)
+        if limiter.allow(user_id):
+            ...
+    """
+
+    __slots__ = ("emission", "tolerance", "max_keys", "sweep_interval", "_tat", "_next_sweep")
+
+    def __init__(
+        self,
+        calls: int = 1,
+        per: float = 0.5,
+        max_keys: int = 100_000,
+        sweep_interval: float = 60.0
+    ):
+        """
+        Args:
+            calls: Number of allowed calls within the time period
+            per: Time period in seconds
+            max_keys: Hard cap on tracked keys
+            sweep_interval: How often expired keys are purged, seconds
+        """
+        self.emission = per / calls
+        self.tolerance = per - self.emission
+        self.max_keys = max_keys
+        self.sweep_interval = sweep_interval
+        self._tat: dict[int, float] = {}
+        self._next_sweep = 0.0
+
+    def __len__(self) -> int:
+        return len(self._tat)
+
+    def allow(self, key: int, now: Optional[float] = None) -> bool:
+        """Register a call for key - False if it exceeds the rate"""
+        if now is None:
+            now = time.monotonic()
+        if now >= self._next_sweep:
+            self.sweep(now)
+
+        tat = self._tat.pop(key, now)
+        if tat < now:
+            tat = now
+        elif tat - now > self.tolerance:
+            self._tat[key] = tat
+            return False
+
+        if len(self._tat) >= self.max_keys:
+            self._evict(now)
+        # Re-inserted at the end: dict order is least recently seen first
+        self._tat[key] = tat + self.emission
+        return True
+
+    async def acquire(self, key: int) -> bool:
+        """Async interface shared with RedisGCRALimiter"""
+        return self.allow(key)
+
+    def sweep(self, now: Optional[float] = None) -> int:
+        """Drop expired keys, returns number of removed keys"""
+        if now is None:
+            now = time.monotonic()
+        before = len(self._tat)
+        self._tat = {k: tat for k, tat in self._tat.items() if tat > now}
+        self._next_sweep = now + self.sweep_interval
+        return before - len(self._tat)
+
+    def _evict(self, now: float) -> None:
+        """Make room in batches so eviction stays amortized O(1)"""
+        self.sweep(now)
+        low_water = self.max_keys * 9 // 10
+        if len(self._tat) > low_water:
+            # Front of the dict = least recently seen
+            self._tat = dict(islice(self._tat.items(), len(self._tat) - low_water, None))
+
+
+class RedisGCRALimiter:
+    """
+    GCRA limiter shared by all workers - one EVALSHA round-trip per check
+
+    Each key holds the TAT in milliseconds and expires by itself once it is
+    in the past, so Redis never accumulates idle users. The clock is Redis'
+    own TIME, so workers with skewed clocks still agree on every TAT.
+
+    Usage:
+        limiter = RedisGCRALimiter(redis, calls=3, per=2)
+        if await limiter.acquire(user_id):
+            ...
+    """
+
+    SCRIPT = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local emission = tonumber(ARGV[1])
+local tolerance = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat or tat < now then
+    tat = now
+elseif tat - now > tolerance then
+    return 0
+end
+tat = tat + emission
+redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+return 1
+"""
+
+    __slots__ = ("emission", "tolerance", "prefix", "_script")
+
+    def __init__(self, redis: Redis, calls: int = 1, per: float = 0.5, prefix: str = "throttle:"):
+        """
+        Args:
+            redis: Async Redis client
+            calls: Number of allowed calls within the time period
+            per: Time period in seconds
+            prefix: Key prefix, one key per user
+        """
+        self.emission = max(1, round(per * 1000 / calls))
+        self.tolerance = round(per * 1000) - self.emission
+        self.prefix = prefix
+        self._script = redis.register_script(self.SCRIPT)
+
+    async def acquire(self, key: int) -> bool:
+        """Register a call for key - fails open if Redis is unavailable"""
+        try:
+            allowed = await self._script(
+                keys=[f"{self.prefix}{key}"],
+                args=[self.emission, self.tolerance],
+            )
+        except Exception as e:
+            logger.warning(f"Redis throttling unavailable, allowing: {e}")
+            return True
+        return bool(allowed)
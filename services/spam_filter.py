@@ -0,0 +1,198 @@
+"""
+🚫 Spam classification for incoming texts
+"""
+import logging
+import re
+from collections import Counter
+from typing import Callable, Mapping, Optional
+
+import yaml
+
+from core.config import config
+
+logger = logging.getLogger(__name__)
+
+try:
+    from re import _parser as sre_parse  # 3.11+
+except ImportError:
+    import sre_parse
+
+# "(?i)rest" - flags that apply to the whole pattern
+_GLOBAL_FLAGS = re.compile(r"\(\?([aiLmsux]+)\)")
+_GROUPREFS = {"GROUPREF", "GROUPREF_EXISTS", "GROUPREF_IGNORE", "GROUPREF_LOC_IGNORE", "GROUPREF_UNI_IGNORE"}
+
+DEFAULT_RULES: dict[str, str] = {
+    "currency_symbols": r'[@&₽)\$€£¥₹]{3,}',
+    "rare_currencies": r'[₽₴₸₹₺]{2,}',
+    "symbol_runs": r'[@#$%^&*]{5,}',
+}
+
+
+def first_chars(pattern: str) -> Optional[set[str]]:
+    """
+    Characters every match of the pattern starts with - None if unbounded
+
+    Only plain literals, character sets/ranges, groups and repeats of at
+    least one are understood; anything else (alternations, classes like \\d,
+    case-insensitive parts) disables the prefilter.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return None
+    if parsed.state.flags & re.IGNORECASE:
+        return None
+    items = list(parsed)
+    chars: set[str] = set()
+    while items:
+        op, av = items[0]
+        name = str(op)
+        if name == "LITERAL":
+            chars.add(chr(av))
+            return chars
+        if name == "IN":
+            for item_op, item_av in av:
+                item_name = str(item_op)
+                if item_name == "LITERAL":
+                    chars.add(chr(item_av))
+                elif item_name == "RANGE" and item_av[1] - item_av[0] < 256:
+                    chars.update(map(chr, range(item_av[0], item_av[1] + 1)))
+                else:
+                    return None
+            return chars
+        if name in ("MAX_REPEAT", "MIN_REPEAT") and av[0] >= 1:
+            items = list(av[2])
+        elif name == "SUBPATTERN" and not av[1] & re.IGNORECASE:
+            items = list(av[-1])
+        else:
+            return None
+    return None
+
+
+def scope_flags(pattern: str) -> str:
+    """
+    "(?i)viagra" -> "(?i:viagra)"
+
+    Global inline flags are only allowed at the very start of a regex, so a
+    rule using them could not be joined into the alternation as is.
+    """
+    flags, pos = "", 0
+    while (found := _GLOBAL_FLAGS.match(pattern, pos)) is not None:
+        flags, pos = flags + found.group(1), found.end()
+    return f"(?{flags}:{pattern[pos:]})" if flags else pattern
+
+
+def _refers_to_groups(node) -> bool:
+    if isinstance(node, sre_parse.SubPattern):
+        return any(str(op) in _GROUPREFS or _refers_to_groups(av) for op, av in node)
+    if isinstance(node, (tuple, list)):
+        return any(_refers_to_groups(item) for item in node)
+    return False
+
+
+def standalone(pattern: str) -> bool:
+    """Rules with backreferences or named groups keep their own compiled pattern"""
+    return bool(re.compile(pattern).groupindex) or _refers_to_groups(sre_parse.parse(pattern))
+
+
+def valid_rules(rules: Mapping[str, str]) -> dict[str, str]:
+    """Rules that compile - broken ones are logged and skipped"""
+    valid = {}
+    for name, pattern in rules.items():
+        try:
+            re.compile(scope_flags(pattern))
+        except re.error as e:
+            logger.error(f"Spam rule {name!r} skipped: {e}")
+            continue
+        valid[name] = pattern
+    return valid
+
+
+def load_rules(path: str) -> dict[str, str]:
+    """Rule set from a YAML file - {rule name: regex}"""
+    with open(path, "r", encoding="utf-8") as f:
+        rules = yaml.safe_load(f) or {}
+    if not isinstance(rules, dict):
+        raise ValueError(f"{path}: expected a mapping of rule name to regex")
+    return {str(name): str(pattern) for name, pattern in rules.items()}
+
+
+class SpamFilter:
+    """
+    All rules compiled into one alternation - a text is scanned once
+
+    Every rule becomes a named group, so the match tells which rule fired;
+    when several rules match, the hit goes to the one matching first in the
+    text. Global flags ("(?i)...") are scoped to their rule; rules with
+    backreferences or named groups would break once group numbers shift,
+    so they are searched separately after the alternation. When every
+    joined rule starts with a known character set, the union is put in
+    front as a lookahead, so positions that cannot start a match are
+    rejected with a single set test. Texts shorter than min_length are never
+    scanned - keep it at or below the shortest text any rule can match.
+
+    Usage:
+        rule = spam_filter.match(text)   # rule name or None
+    """
+
+    def __init__(self, rules: Mapping[str, str] = DEFAULT_RULES, min_length: int = 2):
+        self.min_length = min_length
+        self._names: dict[str, str] = {}
+        self._standalone: list[tuple[str, Callable]] = []
+        alternatives = []
+        starts: Optional[set[str]] = set()
+        for i, (name, pattern) in enumerate(rules.items()):
+            pattern = scope_flags(pattern)
+            try:
+                compiled = re.compile(pattern)
+            except re.error as e:
+                raise re.error(f"spam rule {name!r}: {e.msg}", pattern, e.pos) from e
+            if standalone(pattern):
+                self._standalone.append((name, compiled.search))
+                continue
+            group = f"r{i}"
+            self._names[group] = name
+            alternatives.append(f"(?P<{group}>{pattern})")
+            chars = first_chars(pattern) if starts is not None else None
+            starts = starts | chars if chars is not None else None
+
+        combined = "|".join(alternatives)
+        if starts:
+            combined = f"(?=[{''.join(re.escape(c) for c in sorted(starts))}])(?:{combined})"
+        self._search = re.compile(combined).search if alternatives else None
+
+        self.hits: Counter = Counter()
+        self.checked = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_config(cls) -> "SpamFilter":
+        rules = DEFAULT_RULES
+        if config.spam_rules:
+            try:
+                rules = load_rules(config.spam_rules)
+            except (OSError, ValueError, yaml.YAMLError) as e:
+                logger.error(f"Spam rules not loaded, using defaults: {e}")
+        return cls(valid_rules(rules), min_length=config.spam_min_length)
+
+    def match(self, text: str) -> Optional[str]:
+        """Name of the rule the text trips, None for a clean text"""
+        if (self._search is None and not self._standalone) or len(text) < self.min_length:
+            self.skipped += 1
+            return None
+        self.checked += 1
+        found = self._search(text) if self._search is not None else None
+        if found is not None:
+            rule = self._names[found.lastgroup]
+        else:
+            rule = next((name for name, search in self._standalone if search(text)), None)
+            if rule is None:
+                return None
+        self.hits[rule] += 1
+        return rule
+
+    def stats(self) -> dict:
+        return {"checked": self.checked, "skipped": self.skipped, "hits": dict(self.hits)}
+
+
+spam_filter = SpamFilter.from_config()
@@ -0,0 +1,83 @@
+"""
+🔁 Update deduplication by update_id
+"""
+import logging
+from collections import deque
+from typing import Optional
+
+from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateDeduplicator:
+    """
+    Idempotency guard for Telegram updates
+
+    Keeps a sliding window of the last `window` update_ids in memory and,
+    when Redis is given, claims every id with SET NX so that several
+    workers (or a retried webhook hitting another worker) agree on who
+    handles it. Redis errors fail open - the update is handled.
+
+    Usage:
+        dedup = UpdateDeduplicator(redis=get_redis())
+        if await dedup.is_new(update["update_id"]):
+            ...
+    """
+
+    __slots__ = ("redis", "ttl", "prefix", "_seen", "_order", "duplicates")
+
+    def __init__(
+        self,
+        window: int = 10_000,
+        redis: Optional[Redis] = None,
+        ttl: int = 3600,
+        prefix: str = "update:"
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.prefix = prefix
+        self._seen: set[int] = set()
+        self._order: deque[int] = deque(maxlen=window)
+        self.duplicates = 0
+
+    def _remember(self, update_id: int) -> None:
+        if len(self._order) == self._order.maxlen:
+            self._seen.discard(self._order[0])
+        self._order.append(update_id)
+        self._seen.add(update_id)
+
+    async def is_new(self, update_id: Optional[int]) -> bool:
+        """True the first time an update_id is seen"""
+        if update_id is None:
+            return True
+        if update_id in self._seen:
+            self.duplicates += 1
+            return False
+        self._remember(update_id)
+
+        if self.redis is not None:
+            try:
+                claimed = await self.redis.set(f"{self.prefix}{update_id}", 1, nx=True, ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"Redis dedup unavailable: {e}")
+                return True
+            if not claimed:
+                self.duplicates += 1
+                return False
+        return True
+
+    async def forget(self, update_id: Optional[int]) -> None:
+        """Release an id that was claimed but not handled, so a retry gets through"""
+        if update_id is None:
+            return
+        if update_id in self._seen:
+            self._seen.discard(update_id)
+            # A stale entry left in the window would evict the id early once re-claimed
+            # (failure path only - O(window) is fine)
+            self._order.remove(update_id)
+        if self.redis is not None:
+            try:
+                await self.redis.delete(f"{self.prefix}{update_id}")
+            except Exception as e:
+                logger.warning(f"Redis dedup unavailable: {e}")
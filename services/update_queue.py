@@ -0,0 +1,142 @@
+"""
+📥 Background update processing for the webhook
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Optional
+
+from aiogram import Bot, Dispatcher
+
+logger = logging.getLogger(__name__)
+
+
+def route_key(update: dict[str, Any]) -> int:
+    """User (or chat) an update belongs to - falls back to update_id"""
+    for value in update.values():
+        if not isinstance(value, dict):
+            continue
+        sender = value.get("from") or value.get("user")
+        if isinstance(sender, dict) and "id" in sender:
+            return sender["id"]
+        chat = value.get("chat") or (value.get("message") or {}).get("chat")
+        if isinstance(chat, dict) and "id" in chat:
+            return chat["id"]
+    return update.get("update_id", 0)
+
+
+class UpdateQueue:
+    """
+    Bounded work queue between the webhook endpoint and the dispatcher
+
+    Every consumer owns one queue and an update is routed by its user id,
+    so updates of one user are handled strictly in order while different
+    users are handled in parallel. When the queues are full put() waits up
+    to put_timeout and then reports the update as dropped (Telegram retries).
+
+    Usage:
+        queue = UpdateQueue(dp, bot, workers=8, maxsize=1000)
+        queue.start()
+        accepted = await queue.put(raw_update)
+        await queue.stop()      # drains what is already queued
+    """
+
+    def __init__(
+        self,
+        dp: Dispatcher,
+        bot: Bot,
+        workers: int = 8,
+        maxsize: int = 1000,
+        put_timeout: float = 5.0
+    ):
+        self.dp = dp
+        self.bot = bot
+        self.put_timeout = put_timeout
+        per_worker = max(1, maxsize // workers)
+        self._queues = [asyncio.Queue(maxsize=per_worker) for _ in range(workers)]
+        self._tasks: list[asyncio.Task] = []
+        self._accepting = False
+
+        self.received = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self._busy_time = 0.0
+        self._wait_time = 0.0
+
+    @property
+    def depth(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def start(self) -> None:
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._consume(q), name=f"update-worker-{i}")
+            for i, q in enumerate(self._queues)
+        ]
+
+    async def put(self, update: dict[str, Any]) -> bool:
+        """Queue an update - False if it was not accepted"""
+        if not self._accepting:
+            self.dropped += 1
+            return False
+        queue = self._queues[route_key(update) % len(self._queues)]
+        item = (time.perf_counter(), update)
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            try:
+                await asyncio.wait_for(queue.put(item), self.put_timeout)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning(f"Update queue full, dropped update {update.get('update_id')}")
+                return False
+        self.received += 1
+        depth = self.depth
+        if depth > self.max_depth:
+            self.max_depth = depth
+        return True
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        while True:
+            queued_at, update = await queue.get()
+            started = time.perf_counter()
+            self._wait_time += started - queued_at
+            try:
+                await self.dp.feed_raw_update(self.bot, update)
+                self.processed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Update {update.get('update_id')} failed: {e}")
+            finally:
+                self._busy_time += time.perf_counter() - started
+                queue.task_done()
+
+    async def stop(self, timeout: Optional[float] = 30.0) -> None:
+        """Stop accepting, finish queued updates (up to timeout), stop consumers"""
+        self._accepting = False
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(q.join() for q in self._queues)), timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Update queue drain timed out, {self.depth} updates left")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict[str, Any]:
+        done = self.processed + self.failed
+        return {
+            "workers": len(self._queues),
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "received": self.received,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "avg_wait_ms": round(self._wait_time / done * 1000, 2) if done else 0.0,
+            "avg_handle_ms": round(self._busy_time / done * 1000, 2) if done else 0.0,
+        }
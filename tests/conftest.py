@@ -0,0 +1,36 @@
+import asyncio
+import os
+import tempfile
+
+# Before any database module is imported - tests never touch the real DB
+_db_dir = tempfile.mkdtemp(prefix="hr-bot-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_db_dir}/test.db"
+os.environ.setdefault("BOT_TOKEN", "1:test")
+
+import pytest
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine on a fresh event loop with empty tables"""
+    import database.models  # noqa: F401 - registers every table
+    from database.config import engine
+    from database.database import engine as app_engine
+    from database.models.base import Base
+    from database.user_cache import user_cache
+
+    async def with_db(coro):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+            await app_engine.dispose()
+
+    def runner(coro):
+        user_cache.clear()
+        return asyncio.run(with_db(coro))
+
+    return runner
@@ -0,0 +1,97 @@
+import asyncio
+import datetime
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from bot.middlewares.anti_spam import AntiSpamMiddleware
+from bot.middlewares.pipeline import DATABASE, MEMORY, NETWORK, MiddlewarePipeline, Stage
+
+USER = User(id=1, is_bot=False, first_name="Ann")
+
+
+class Recorder(BaseMiddleware):
+    def __init__(self, name: str, calls: list, delay: float = 0.0):
+        self.name = name
+        self.calls = calls
+        self.delay = delay
+
+    async def __call__(self, handler, event, data):
+        self.calls.append(self.name)
+        await asyncio.sleep(self.delay)
+        return await handler(event, data)
+
+
+def message(update_id: int, text: str) -> Update:
+    return Update(update_id=update_id, message=Message(
+        message_id=update_id,
+        date=datetime.datetime.now(),
+        chat=Chat(id=1, type="private"),
+        from_user=USER,
+        text=text,
+    ))
+
+
+def callback(update_id: int) -> Update:
+    return Update(update_id=update_id, callback_query=CallbackQuery(
+        id=str(update_id), from_user=USER, chat_instance="c", data="d"
+    ))
+
+
+def build(calls: list) -> MiddlewarePipeline:
+    return MiddlewarePipeline([
+        Stage("db", lambda _: Recorder("db", calls, delay=0.02), cost=DATABASE),
+        Stage("redis", lambda _: Recorder("redis", calls), cost=NETWORK),
+        Stage("anti_spam", lambda _: AntiSpamMiddleware(), observers=("message",)),
+        Stage("memory", lambda _: Recorder("memory", calls), cost=MEMORY),
+    ])
+
+
+def feed(pipeline: MiddlewarePipeline, updates: list, calls: list) -> None:
+    dp = Dispatcher()
+    pipeline.setup(dp)
+
+    @dp.message()
+    async def on_message(_):
+        calls.append("handler")
+
+    @dp.callback_query()
+    async def on_callback(_):
+        calls.append("handler")
+
+    async def scenario():
+        bot = Bot("1:test")
+        for update in updates:
+            await dp.feed_update(bot, update)
+        await bot.session.close()
+
+    asyncio.run(scenario())
+
+
+def test_cheap_stages_run_first():
+    pipeline = build([])
+    assert [stage.name for stage in pipeline.ordered()] == ["anti_spam", "memory", "redis", "db"]
+
+
+def test_rejected_updates_never_reach_db_stages():
+    calls: list = []
+    pipeline = build(calls)
+    feed(pipeline, [message(1, "hello"), message(2, "$$$ spam"), callback(3)], calls)
+
+    # The spam message stops at anti_spam; the callback query skips it (message only)
+    assert calls == ["memory", "redis", "db", "handler"] * 2
+    stats = pipeline.stats()
+    assert (stats["message"]["anti_spam"]["calls"], stats["message"]["anti_spam"]["rejected"]) == (2, 1)
+    assert stats["message"]["db"]["calls"] == 1
+    assert "anti_spam" not in stats["callback_query"]
+    assert stats["callback_query"]["db"]["calls"] == 1
+
+
+def test_stage_time_excludes_downstream():
+    calls: list = []
+    pipeline = build(calls)
+    feed(pipeline, [message(1, "hello")], calls)
+
+    stats = pipeline.stats()["message"]
+    assert stats["db"]["avg_ms"] >= 15
+    assert stats["memory"]["avg_ms"] < 15
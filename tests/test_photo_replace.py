@@ -0,0 +1,31 @@
+import pytest
+
+from database.db import DB
+from database.unit_of_work import UnitOfWork
+
+
+def test_photo_swap_survives_a_rolled_back_handler(run):
+    async def scenario():
+        await DB.user.create(1, "Ann")
+        app = await DB.app.create(1)
+        await DB.app.set_photo(app.id, "original.jpg")
+
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork():
+                assert await DB.app.replace_photo(app.id, "original.jpg", "normalized.jpg", "thumb.jpg")
+                raise RuntimeError("handler failed")
+        return await DB.app.get(app.id)
+
+    app = run(scenario())
+    assert (app.photo_path, app.photo_thumb_path) == ("normalized.jpg", "thumb.jpg")
+
+
+def test_photo_swap_skips_a_newer_photo(run):
+    async def scenario():
+        await DB.user.create(1, "Ann")
+        app = await DB.app.create(1)
+        await DB.app.set_photo(app.id, "newer.jpg")
+        replaced = await DB.app.replace_photo(app.id, "original.jpg", "normalized.jpg")
+        return replaced, (await DB.app.get(app.id)).photo_path
+
+    assert run(scenario()) == (False, "newer.jpg")
@@ -0,0 +1,49 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from services.rate_limiter import RedisGCRALimiter
+
+
+def test_allows_burst_then_denies():
+    async def scenario():
+        limiter = RedisGCRALimiter(FakeAsyncRedis(), calls=3, per=10)
+        return [await limiter.acquire(1) for _ in range(4)]
+
+    assert asyncio.run(scenario()) == [True, True, True, False]
+
+
+def test_refills_after_emission_interval():
+    async def scenario():
+        limiter = RedisGCRALimiter(FakeAsyncRedis(), calls=1, per=0.2)
+        first, second = await limiter.acquire(1), await limiter.acquire(1)
+        await asyncio.sleep(0.25)
+        return first, second, await limiter.acquire(1)
+
+    assert asyncio.run(scenario()) == (True, False, True)
+
+
+def test_keys_are_isolated_per_user_and_prefix():
+    async def scenario():
+        redis = FakeAsyncRedis()
+        messages = RedisGCRALimiter(redis, calls=1, per=10, prefix="throttle:message:")
+        callbacks = RedisGCRALimiter(redis, calls=1, per=10, prefix="throttle:callback_query:")
+        return [
+            await messages.acquire(1),
+            await messages.acquire(1),
+            await messages.acquire(2),
+            await callbacks.acquire(1),
+            await callbacks.acquire(1),
+        ]
+
+    assert asyncio.run(scenario()) == [True, False, True, True, False]
+
+
+def test_keys_expire_once_idle():
+    async def scenario():
+        redis = FakeAsyncRedis()
+        limiter = RedisGCRALimiter(redis, calls=2, per=10, prefix="t:")
+        await limiter.acquire(1)
+        return await redis.pttl("t:1")
+
+    assert 0 < asyncio.run(scenario()) <= 5000
@@ -0,0 +1,58 @@
+import logging
+import re
+
+import pytest
+
+from services import spam_filter as spam_module
+from services.spam_filter import DEFAULT_RULES, SpamFilter, scope_flags
+
+
+def test_default_rules_match_as_before():
+    spam = SpamFilter()
+    assert spam.match("$$$ EARN FAST") == "currency_symbols"
+    assert spam.match("100₽₴ a day") == "rare_currencies"
+    assert spam.match("#%^&* pump") == "symbol_runs"
+    assert spam.match("Toshkent shahri, Chilonzor tumani") is None
+
+
+def test_global_flags_are_scoped_to_the_rule():
+    assert scope_flags("(?i)viagra") == "(?i:viagra)"
+    assert scope_flags("(?i)(?s)a.b") == "(?is:a.b)"
+
+    spam = SpamFilter({"pills": "(?i)viagra", "money": r"[$]{3,}"})
+    assert spam.match("cheap VIAGRA") == "pills"
+    assert spam.match("$$$") == "money"
+    # The flag does not leak into the other rules
+    assert SpamFilter({"pills": "(?i)viagra", "word": "spam"}).match("SPAM") is None
+
+
+def test_backreference_rules_are_searched_separately():
+    spam = SpamFilter({"money": r"[$]{3,}", "repeats": r"(\w)\1{4,}", "named": r"(?P<c>z)(?P=c)"})
+    assert spam.match("aaaaaa") == "repeats"
+    assert spam.match("zz") == "named"
+    assert spam.match("$$$") == "money"
+    assert spam.match("abcdef") is None
+    assert spam.stats()["hits"] == {"repeats": 1, "named": 1, "money": 1}
+
+
+def test_short_texts_are_skipped():
+    spam = SpamFilter(DEFAULT_RULES, min_length=3)
+    assert spam.match("$$") is None
+    assert spam.stats()["skipped"] == 1
+
+
+def test_broken_rules_from_config_are_skipped(tmp_path, monkeypatch, caplog):
+    rules = tmp_path / "rules.yaml"
+    rules.write_text('broken: "a(?i)b"\nunclosed: "("\nlinks: "t\\\\.me/"\n', encoding="utf-8")
+    monkeypatch.setattr(spam_module.config, "spam_rules", str(rules))
+
+    with caplog.at_level(logging.ERROR, logger=spam_module.__name__):
+        spam = SpamFilter.from_config()
+
+    assert spam.match("join t.me/x") == "links"
+    assert "broken" in caplog.text and "unclosed" in caplog.text
+
+
+def test_broken_rule_names_itself():
+    with pytest.raises(re.error, match="'broken'"):
+        SpamFilter({"broken": "("})
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from aiogram import Bot
+from aiogram.methods import SendMessage
+
+from bot.middlewares.database import CommitBeforeRequest
+from database.config import async_session
+from database.db import DB
+from database.models.user import User
+from database.unit_of_work import UnitOfWork, after_commit, checkpoint, session_scope
+
+
+async def stored(user_id: int) -> bool:
+    async with async_session() as s:
+        return await s.get(User, user_id) is not None
+
+
+def test_rollback_discards_the_whole_update(run):
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork():
+                await DB.user.create(1, "Ann")
+                raise RuntimeError
+        return await stored(1)
+
+    assert run(scenario()) is False
+
+
+def test_checkpoint_makes_earlier_work_final(run):
+    async def scenario():
+        committed = []
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork():
+                await DB.user.create(1, "Ann")
+                after_commit(lambda: committed.append(1))
+                await checkpoint()
+                assert committed == [1]
+                await DB.user.create(2, "Bob")
+                raise RuntimeError
+        return await stored(1), await stored(2)
+
+    assert run(scenario()) == (True, False)
+
+
+def test_spawned_tasks_never_commit_the_handlers_transaction(run):
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork():
+                await DB.user.create(1, "Ann")
+                await asyncio.create_task(checkpoint())
+                raise RuntimeError
+        return await stored(1)
+
+    assert run(scenario()) is False
+
+
+def test_bot_requests_are_sent_outside_the_transaction(run):
+    async def scenario():
+        seen = []
+
+        async def make_request(bot, method):
+            # Another connection already sees the row - no lock held during the send
+            seen.append(await stored(1))
+
+        async with UnitOfWork():
+            await DB.user.create(1, "Ann")
+            await CommitBeforeRequest()(make_request, Bot("1:test"), SendMessage(chat_id=1, text="hi"))
+        return seen
+
+    assert run(scenario()) == [True]
+
+
+async def session_of_task() -> object:
+    async with session_scope() as s:
+        return s
+
+
+def test_spawned_tasks_get_their_own_session(run):
+    async def scenario():
+        async with UnitOfWork() as handler_session:
+            spawned = await asyncio.create_task(session_of_task())
+        return spawned is handler_session
+
+    assert run(scenario()) is False
+
+
+def test_tasks_started_by_checkpoint_callbacks_get_their_own_session(run):
+    async def scenario():
+        tasks = []
+        async with UnitOfWork() as handler_session:
+            await DB.user.create(1, "Ann")
+            after_commit(lambda: tasks.append(asyncio.create_task(session_of_task())))
+            await checkpoint()
+            spawned = await tasks[0]
+        return spawned is handler_session
+
+    assert run(scenario()) is False
@@ -0,0 +1,43 @@
+import asyncio
+
+from fakeredis import FakeAsyncRedis
+
+from services.update_dedup import UpdateDeduplicator
+
+
+def test_duplicates_are_dropped():
+    async def scenario():
+        dedup = UpdateDeduplicator(window=10)
+        return [await dedup.is_new(1), await dedup.is_new(1), await dedup.is_new(None)], dedup.duplicates
+
+    assert asyncio.run(scenario()) == ([True, False, True], 1)
+
+
+def test_forgotten_id_is_reclaimed_and_kept_for_a_full_window():
+    async def scenario():
+        dedup = UpdateDeduplicator(window=3)
+        await dedup.is_new(1)
+        await dedup.forget(1)
+        assert await dedup.is_new(1)  # a retry gets through
+        await dedup.is_new(2)
+        await dedup.is_new(3)
+        # 1 is still inside the window of the last 3 ids - no stale entry evicted it
+        assert not await dedup.is_new(1)
+        await dedup.is_new(4)
+        # now it has slid out
+        assert await dedup.is_new(1)
+
+    asyncio.run(scenario())
+
+
+def test_claims_are_shared_through_redis():
+    async def scenario():
+        redis = FakeAsyncRedis()
+        first, second, third = (UpdateDeduplicator(redis=redis) for _ in range(3))
+        claimed = [await first.is_new(7), await second.is_new(7)]
+        await first.forget(7)
+        # The retry lands on a worker that has not seen it
+        claimed.append(await third.is_new(7))
+        return claimed
+
+    assert asyncio.run(scenario()) == [True, False, True]
@@ -0,0 +1,35 @@
+import pytest
+
+from database.db import DB
+from database.unit_of_work import UnitOfWork
+from database.user_cache import user_cache
+
+
+def test_profile_is_cached_only_after_commit(run):
+    async def scenario():
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork():
+                await DB.user.upsert_profile(1, "Ann")
+                assert user_cache.get(1) is None
+                raise RuntimeError
+        rolled_back = user_cache.get(1)
+
+        async with UnitOfWork():
+            await DB.user.upsert_profile(1, "Ann")
+        return rolled_back, user_cache.get(1)
+
+    rolled_back, committed = run(scenario())
+    assert rolled_back is None
+    assert committed.first_name == "Ann"
+
+
+def test_stale_profile_cached_during_a_write_is_dropped_on_commit(run):
+    async def scenario():
+        profile, _ = await DB.user.upsert_profile(1, "Ann")
+        async with UnitOfWork():
+            await DB.user.set_language(1, "ru")
+            # A concurrent reader re-caches the still committed old row
+            user_cache.put(profile)
+        return user_cache.get(1)
+
+    assert run(scenario()) is None
@@ -0,0 +1,36 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from database.config import async_session
+from database.models.user import User
+from database.repositories.user_repository import UserRepo
+
+
+async def upsert(user_id: int, first_name: str):
+    async with async_session() as s:
+        return await UserRepo.upsert(s, user_id, first_name, username=f"u{user_id}")
+
+
+def test_concurrent_upserts_create_one_row(run):
+    async def scenario():
+        results = await asyncio.gather(*(upsert(42, f"Name {i}") for i in range(20)))
+        async with async_session() as s:
+            rows = await s.scalar(select(func.count()).select_from(User).where(User.id == 42))
+        return results, rows
+
+    results, rows = run(scenario())
+    assert rows == 1
+    assert [created for _, created in results].count(True) == 1
+    assert {profile.id for profile, _ in results} == {42}
+
+
+def test_upsert_updates_names_of_existing_user(run):
+    async def scenario():
+        first = await upsert(7, "Ann")
+        second = await upsert(7, "Anna")
+        return first, second
+
+    (first, first_created), (second, second_created) = run(scenario())
+    assert first_created and not second_created
+    assert first.first_name == "Ann" and second.first_name == "Anna"
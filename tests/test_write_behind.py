@@ -0,0 +1,51 @@
+import pytest
+
+from database.db import DB
+from database.unit_of_work import UnitOfWork
+from database.write_behind import app_buffer
+
+
+@pytest.fixture
+def buffered(monkeypatch):
+    monkeypatch.setattr(app_buffer, "enabled", True)
+    monkeypatch.setattr(app_buffer, "_pending", {})
+    monkeypatch.setattr(app_buffer, "_inflight", {})
+
+
+async def two_drafts():
+    await DB.user.create(1, "Ann")
+    await DB.user.create(2, "Bob")
+    ann = await DB.app.create(1)
+    bob = await DB.app.create(2)
+    await DB.app.set_first_name(ann.id, "Ann")
+    await DB.app.set_first_name(bob.id, "Bob")
+    return ann.id, bob.id
+
+
+def test_reads_flush_only_the_users_applications(run, buffered):
+    async def scenario():
+        ann_id, bob_id = await two_drafts()
+        async with UnitOfWork():
+            draft = await DB.app.get_draft(1)
+        assert draft.first_name == "Ann"
+        assert app_buffer.pending(ann_id) == {}
+        assert app_buffer.pending(bob_id) == {"first_name": "Bob"}
+
+    run(scenario())
+
+
+def test_rolled_back_flush_is_staged_again(run, buffered):
+    async def scenario():
+        ann_id, bob_id = await two_drafts()
+        with pytest.raises(RuntimeError):
+            async with UnitOfWork():
+                await DB.app.flush()
+                assert app_buffer.pending(bob_id) == {}
+                raise RuntimeError("handler failed")
+        assert app_buffer.pending(ann_id) == {"first_name": "Ann"}
+        assert app_buffer.pending(bob_id) == {"first_name": "Bob"}
+
+        await DB.app.flush()
+        assert (await DB.app.get(bob_id)).first_name == "Bob"
+
+    run(scenario())
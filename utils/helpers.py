@@ -1,16 +1,22 @@
 """
 Helper functions
 """
+from typing import Optional
 from aiogram.fsm.context import FSMContext
+from bot.validators.validator import button_lang
 
 def format_user_mention(user_id: int, name: str) -> str:
     """Format user mention for HTML"""
     return f'<a href="tg://user?id={user_id}">{name}</a>'
 
-async def get_lang(state: FSMContext, user_lang: str = "uz") -> str:
-    """Get language - priority: state > user_lang > default"""
+async def get_lang(state: FSMContext, user_lang: str = "uz", text: Optional[str] = None) -> str:
+    """Get language - priority: state > language of the pressed button > user_lang > default"""
     data = await state.get_data()
-    return data.get("lang") or user_lang or "uz"
+    if data.get("lang"):
+        return data["lang"]
+    if text:
+        return button_lang(text) or user_lang or "uz"
+    return user_lang or "uz"
 
 
 async def get_app_id(state: FSMContext) -> int: